@@ -11,6 +11,10 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "BeenCoin API"
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./beencoin.db")
+    # Connection pool (server databases only; ignored for SQLite)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "32"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "32"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds
     SECRET_KEY: str = os.getenv("SECRET_KEY", secrets.token_urlsafe(32))
     ALLOWED_ORIGINS: List[str] = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000").split(",")
     ALGORITHM: str = "HS256"
@@ -53,3 +57,7 @@ class Settings(BaseSettings):
 
 
 settings = Settings()
+
+# Membership checks run on every order/alert; SUPPORTED_SYMBOLS stays the
+# ordered list for iteration and serialization.
+SUPPORTED_SYMBOL_SET = frozenset(settings.SUPPORTED_SYMBOLS)
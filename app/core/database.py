@@ -1,11 +1,76 @@
+import asyncio
+import logging
+from sqlalchemy import text
 from sqlmodel import create_engine, Session
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 # aiosqlite 드라이버 제거 → 동기 SQLite 사용
 DATABASE_URL = settings.DATABASE_URL.replace("sqlite+aiosqlite", "sqlite")
 
-engine = create_engine(DATABASE_URL, echo=False, connect_args={"check_same_thread": False})
+POOL_PING_INTERVAL = 30  # seconds
+
+
+def build_engine(url: str):
+    if url.startswith("sqlite"):
+        return create_engine(url, echo=False, connect_args={"check_same_thread": False})
+    # Sized for the threadpool that runs the DB sections of requests and
+    # engine fills. LIFO reuses the most recently used (warm) connections.
+    # No pre-ping: a SELECT 1 on every checkout costs a round-trip per
+    # request; stale connections are handled by pool_recycle and
+    # pool_health_loop instead.
+    return create_engine(
+        url, echo=False,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=False,
+        pool_use_lifo=True,
+    )
+
+
+engine = build_engine(DATABASE_URL)
+
+
+def begin_write(session: Session):
+    """
+    Start `session`'s transaction as a writer; call it before the
+    transaction's first statement. On SQLite this issues BEGIN IMMEDIATE:
+    the write lock is taken up front, so concurrent writers wait out the
+    busy timeout instead of failing a read-to-write lock upgrade, and
+    SAVEPOINTs nest inside a real transaction (pysqlite only emits BEGIN in
+    front of DML, so a SAVEPOINT issued first would run outside one and its
+    RELEASE would commit for good). Readers keep pysqlite's default and hold
+    no lock between statements. Other dialects just start the transaction.
+    """
+    conn = session.connection()
+    if conn.dialect.name == "sqlite" and not conn.connection.dbapi_connection.in_transaction:
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
 
 def get_session():
-    with Session(engine) as session:
+    # Objects written in a request are returned as-is; don't expire them on
+    # commit just to re-SELECT the values we already hold.
+    with Session(engine, expire_on_commit=False) as session:
         yield session
+
+
+def _ping():
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+async def pool_health_loop():
+    """
+    Background replacement for pool_pre_ping: ping one connection every
+    POOL_PING_INTERVAL seconds and, if the database went away, drop the
+    whole pool so requests get fresh connections instead of dead ones.
+    """
+    while True:
+        await asyncio.sleep(POOL_PING_INTERVAL)
+        try:
+            await asyncio.to_thread(_ping)
+        except Exception as e:
+            logger.warning("Health check failed, resetting pool: %s", e)
+            engine.dispose()
@@ -5,15 +5,32 @@ from app.models.database import create_db_and_tables
 from app.routers import auth, orders, account, websocket, alerts, analytics, leaderboard, achievements, market
 from app.services.binance_service import close_client
 from app.services.price_engine import price_engine
+from app.services.order_batcher import order_batcher
+from app.core.database import DATABASE_URL, pool_health_loop
 from contextlib import asynccontextmanager
+import asyncio
+import logging
 import os
 
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO"),
+    format="%(asctime)s %(levelname)s [%(name)s] %(message)s",
+)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     create_db_and_tables()
     await price_engine.start()
+    order_batcher.start()
+    # SQLite has no server-side connections to go stale, so nothing to ping
+    pool_health = None
+    if not DATABASE_URL.startswith("sqlite"):
+        pool_health = asyncio.create_task(pool_health_loop())
     yield
+    if pool_health:
+        pool_health.cancel()
+    await order_batcher.stop()
     await price_engine.stop()
     await close_client()
 
@@ -31,6 +48,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE"],
     allow_headers=["Authorization", "Content-Type"],
+    expose_headers=["X-Next-Cursor", "X-Next-Cursor-Id"],
 )
 
 app.include_router(auth.router, prefix=settings.API_V1_STR)
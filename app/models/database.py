@@ -1,7 +1,12 @@
-from sqlmodel import SQLModel, Field, Relationship
+from sqlmodel import SQLModel, Field, Relationship, Session, select
+from sqlalchemy import Column, Index, Integer, func, inspect, text
 from typing import Optional, List
 from datetime import datetime
+from app.utils.clock import utcnow
 from decimal import Decimal
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class User(SQLModel, table=True):
@@ -9,7 +14,7 @@ class User(SQLModel, table=True):
     username: str = Field(unique=True, index=True)
     hashed_password: str
     is_active: bool = True
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
     # Streak
     current_streak: int = Field(default=0)
     best_streak: int = Field(default=0)
@@ -23,19 +28,40 @@ class User(SQLModel, table=True):
     missions: List["UserMission"] = Relationship(back_populates="user")
 
 
+# Optimistic concurrency for the balance row: every ORM UPDATE is issued as
+# "... WHERE id = ? AND version_id = ?" and bumps the version, so a writer
+# holding a stale copy gets StaleDataError instead of silently overwriting.
+_account_version = Column("version_id", Integer, nullable=False, server_default=text("0"))
+
+
 class TradingAccount(SQLModel, table=True):
+    __mapper_args__ = {"version_id_col": _account_version}
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: int = Field(foreign_key="user.id")
+    user_id: int = Field(foreign_key="user.id", index=True)  # every order looks the account up by user
     balance: Decimal = Field(default=Decimal('1000000.00000000'), max_digits=20, decimal_places=8)
     total_profit: Decimal = Field(default=Decimal('0.00000000'), max_digits=20, decimal_places=8)
     use_bnb_fee: bool = Field(default=False)
     trading_volume_30d: Decimal = Field(default=Decimal('0.00'), max_digits=20, decimal_places=2)
     fee_tier: str = Field(default="Regular")
+    version_id: int = Field(default=0, sa_column=_account_version)
     user: User = Relationship(back_populates="accounts")
     positions: List["Position"] = Relationship(back_populates="account")
 
 
 class Order(SQLModel, table=True):
+    __table_args__ = (
+        # "my orders, newest first" — btree scans backwards for DESC
+        Index("ix_order_user_created", "user_id", "created_at"),
+        # The engine's per-tick trigger query only ever wants PENDING orders of
+        # one symbol; a partial index stays as small as the open order book.
+        Index(
+            "ix_order_pending_symbol", "symbol",
+            postgresql_where=text("order_status = 'PENDING'"),
+            sqlite_where=text("order_status = 'PENDING'"),
+        ),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id")
     symbol: str = Field(index=True)
@@ -49,12 +75,15 @@ class Order(SQLModel, table=True):
     filled_price: Optional[Decimal] = Field(default=None, max_digits=20, decimal_places=8)
     commission: Decimal = Field(default=Decimal('0.00000000'), max_digits=20, decimal_places=8)
     commission_asset: str = Field(default="USDT")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow)
     user: User = Relationship(back_populates="orders")
 
 
 class Position(SQLModel, table=True):
+    # One position per (account, symbol); also serves every fill-path lookup
+    __table_args__ = (Index("ix_position_acct_sym", "account_id", "symbol", unique=True),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     account_id: int = Field(foreign_key="tradingaccount.id")
     symbol: str
@@ -67,6 +96,9 @@ class Position(SQLModel, table=True):
 
 
 class TransactionHistory(SQLModel, table=True):
+    # History endpoint and post-trade hooks: WHERE user_id = ? [AND timestamp >= ?] ORDER BY timestamp
+    __table_args__ = (Index("ix_tx_user_ts", "user_id", "timestamp"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id")
     order_id: Optional[int] = Field(default=None, foreign_key="order.id")
@@ -78,11 +110,20 @@ class TransactionHistory(SQLModel, table=True):
     fee_asset: str = Field(default="USDT")
     is_maker: bool = Field(default=False)
     realized_pnl: Decimal = Field(default=Decimal('0.00000000'), max_digits=20, decimal_places=8)
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=utcnow)
     user: User = Relationship(back_populates="transactions")
 
 
 class PriceAlert(SQLModel, table=True):
+    # The engine's per-tick alert query: active alerts of one symbol, by target
+    __table_args__ = (
+        Index(
+            "ix_alert_active_symbol_target", "symbol", "target_price",
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active = 1"),
+        ),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id", index=True)
     symbol: str = Field(index=True)
@@ -90,7 +131,7 @@ class PriceAlert(SQLModel, table=True):
     condition: str
     is_active: bool = Field(default=True, index=True)
     triggered_at: Optional[datetime] = Field(default=None)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
     memo: str = Field(default="")
     user: User = Relationship(back_populates="alerts")
 
@@ -101,7 +142,7 @@ class UserAchievement(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id", index=True)
     achievement_key: str = Field(index=True)  # e.g. "first_trade"
-    unlocked_at: datetime = Field(default_factory=datetime.utcnow)
+    unlocked_at: datetime = Field(default_factory=utcnow)
     user: User = Relationship(back_populates="achievements")
 
 
@@ -123,3 +164,53 @@ class UserMission(SQLModel, table=True):
 def create_db_and_tables():
     from app.core.database import engine
     SQLModel.metadata.create_all(engine)
+    # create_all doesn't alter existing tables; add columns introduced later.
+    account_columns = {c["name"] for c in inspect(engine).get_columns("tradingaccount")}
+    if "version_id" not in account_columns:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE tradingaccount ADD COLUMN version_id INTEGER NOT NULL DEFAULT 0"))
+    position_indexes = {i["name"] for i in inspect(engine).get_indexes("position")}
+    if "ix_position_acct_sym" not in position_indexes:
+        _merge_duplicate_positions(engine)
+    # create_all skips tables that already exist, so add indexes introduced
+    # after the first deploy explicitly.
+    for table in (
+        TradingAccount.__table__, Order.__table__, Position.__table__,
+        TransactionHistory.__table__, PriceAlert.__table__,
+    ):
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+
+def _merge_duplicate_positions(engine):
+    """
+    Fold duplicate (account_id, symbol) positions into the oldest row so the
+    unique ix_position_acct_sym index can be built on an existing database.
+    """
+    with Session(engine) as session:
+        duplicates = session.exec(
+            select(Position.account_id, Position.symbol)
+            .group_by(Position.account_id, Position.symbol)
+            .having(func.count(Position.id) > 1)
+        ).all()
+        for account_id, symbol in duplicates:
+            kept, *extra = session.exec(
+                select(Position)
+                .where(Position.account_id == account_id, Position.symbol == symbol)
+                .order_by(Position.id)
+            ).all()
+            for position in extra:
+                kept.quantity += position.quantity
+                kept.total_cost += position.total_cost
+                kept.current_value += position.current_value
+                kept.unrealized_profit += position.unrealized_profit
+                session.delete(position)
+            kept.average_price = (
+                (kept.total_cost / kept.quantity).quantize(Decimal('0.00000001'))
+                if kept.quantity > 0 else Decimal('0')
+            )
+            logger.warning(
+                "Merged %d duplicate %s positions of account %s into position %s",
+                len(extra), symbol, account_id, kept.id,
+            )
+        session.commit()
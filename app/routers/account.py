@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 from pydantic import BaseModel
 from sqlmodel import Session
 from app.schemas.account import AccountOut
@@ -7,7 +7,8 @@ from app.services.order_service import get_account_summary, get_transaction_hist
 from app.core.database import get_session
 from app.routers.orders import get_current_user
 from app.core.config import settings
-from typing import List
+from typing import List, Optional
+from datetime import datetime
 
 router = APIRouter(prefix="/account", tags=["account"])
 
@@ -18,18 +19,21 @@ def get_account(current_user=Depends(get_current_user), session: Session = Depen
 
 
 @router.get("/transactions", response_model=List[TransactionOut])
-def get_transactions(current_user=Depends(get_current_user), session: Session = Depends(get_session)):
-    txs = get_transaction_history(session, current_user.id)
-    return [
-        TransactionOut(
-            id=t.id, symbol=t.symbol, side=t.side,
-            quantity=t.quantity, price=t.price,
-            fee=t.fee, fee_asset=t.fee_asset,
-            is_maker=t.is_maker, realized_pnl=t.realized_pnl,
-            timestamp=str(t.timestamp),
-        )
-        for t in txs
-    ]
+def get_transactions(
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    before: Optional[datetime] = None,
+    before_id: Optional[int] = None,
+    current_user=Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    txs, next_cursor = get_transaction_history(session, current_user.id, limit, before, before_id)
+    # Keyset cursor for the next page; pass it back as ?before=&before_id=
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor.isoformat()
+        response.headers["X-Next-Cursor-Id"] = str(txs[-1].id)
+    # Column rows; response_model (TransactionOut) serializes them
+    return txs
 
 
 class BnbFeeToggle(BaseModel):
@@ -21,6 +21,8 @@ def all_achievements():
 @router.post("/check")
 def check_achievements(current_user=Depends(get_current_user), session: Session = Depends(get_session)):
     newly = check_and_award(session, current_user.id)
+    if newly:
+        session.commit()
     return {"newly_unlocked": newly}
 
 
@@ -17,13 +17,10 @@ def register(user: UserCreate, session: Session = Depends(get_session)):
     hashed_password = get_password_hash(user.password)
     db_user = User(username=user.username, hashed_password=hashed_password)
     session.add(db_user)
+    session.flush()  # assigns db_user.id; a brand-new user has no account yet
+    account = TradingAccount(user_id=db_user.id, balance=Decimal(str(settings.INITIAL_BALANCE)))
+    session.add(account)
     session.commit()
-    session.refresh(db_user)
-    existing_account = session.exec(select(TradingAccount).where(TradingAccount.user_id == db_user.id)).first()
-    if not existing_account:
-        account = TradingAccount(user_id=db_user.id, balance=Decimal(str(settings.INITIAL_BALANCE)))
-        session.add(account)
-        session.commit()
     return UserOut(id=db_user.id, username=db_user.username, created_at=str(db_user.created_at))
 
 @router.post("/login")
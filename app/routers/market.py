@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Query
 from app.services.binance_service import get_client
-from app.core.config import settings
+from app.core.config import SUPPORTED_SYMBOL_SET
 
 router = APIRouter(prefix="/market", tags=["market"])
 
@@ -13,7 +13,7 @@ async def get_klines(
     interval: str = Query(default="1h"),
     limit: int = Query(default=200, le=500),
 ):
-    if symbol not in settings.SUPPORTED_SYMBOLS:
+    if symbol not in SUPPORTED_SYMBOL_SET:
         return {"error": "Unsupported symbol"}
     if interval not in VALID_INTERVALS:
         return {"error": f"Invalid interval. Use: {VALID_INTERVALS}"}
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import bindparam
 from sqlmodel import Session, select
 from app.schemas.order import OrderCreate, OrderOut
-from app.services.order_service import create_order, get_user_orders, cancel_order
+from app.services.order_service import create_order, get_user_orders, get_open_orders, cancel_order
 from app.core.database import get_session
 from fastapi.security import OAuth2PasswordBearer
-from typing import List
+from typing import List, Optional
+from datetime import datetime
 from app.utils.security import decode_access_token
 from app.models.database import User
 from app.core.config import settings
@@ -12,13 +14,16 @@ from app.core.config import settings
 router = APIRouter(prefix="/orders", tags=["orders"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
+# Runs on every authenticated request; built once, executed with a bound username
+_SELECT_USER_BY_NAME = select(User).where(User.username == bindparam("username"))
+
 
 def get_current_user(token: str = Depends(oauth2_scheme), session: Session = Depends(get_session)) -> User:
     payload = decode_access_token(token)
     username: str = payload.get("sub")
     if username is None:
         raise HTTPException(status_code=401, detail="Invalid authentication credentials")
-    user = session.exec(select(User).where(User.username == username)).first()
+    user = session.scalar(_SELECT_USER_BY_NAME, {"username": username})
     if user is None:
         raise HTTPException(status_code=401, detail="User not found")
     return user
@@ -50,10 +55,29 @@ async def place_order(
 
 @router.get("", response_model=List[OrderOut])
 def get_orders(
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    before: Optional[datetime] = None,
+    before_id: Optional[int] = None,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    rows, next_cursor = get_user_orders(session, current_user.id, limit, before, before_id)
+    # Keyset cursor for the next page; pass it back as ?before=&before_id=
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor.isoformat()
+        response.headers["X-Next-Cursor-Id"] = str(rows[-1].id)
+    # Column rows; response_model (OrderOut) serializes them
+    return rows
+
+
+@router.get("/open", response_model=List[OrderOut])
+def get_pending_orders(
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
 ):
-    return [_order_to_out(o) for o in get_user_orders(session, current_user.id)]
+    """Every PENDING order, unpaginated, so none falls off the end of the history pages."""
+    return get_open_orders(session, current_user.id)
 
 
 @router.delete("/{order_id}", response_model=OrderOut)
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, validator
 from decimal import Decimal
 from typing import Optional
-from app.core.config import settings
+from app.core.config import SUPPORTED_SYMBOL_SET
 
 
 class AlertCreate(BaseModel):
@@ -12,7 +12,7 @@ class AlertCreate(BaseModel):
 
     @validator('symbol')
     def validate_symbol(cls, v):
-        if v.upper() not in settings.SUPPORTED_SYMBOLS:
+        if v.upper() not in SUPPORTED_SYMBOL_SET:
             raise ValueError(f'Unsupported symbol: {v}')
         return v.upper()
 
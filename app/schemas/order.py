@@ -1,7 +1,12 @@
 from pydantic import BaseModel, validator
+from datetime import datetime
 from decimal import Decimal
 from typing import Optional
-from app.core.config import settings
+from app.core.config import SUPPORTED_SYMBOL_SET
+
+# Storage scale of the Numeric(20, 8) order columns
+_SCALE = Decimal('0.00000001')
+_MAX_INT_DIGITS = 12
 
 
 class OrderCreate(BaseModel):
@@ -14,7 +19,7 @@ class OrderCreate(BaseModel):
 
     @validator('symbol')
     def validate_symbol(cls, v):
-        if v.upper() not in settings.SUPPORTED_SYMBOLS:
+        if v.upper() not in SUPPORTED_SYMBOL_SET:
             raise ValueError(f'Unsupported symbol: {v}')
         return v.upper()
 
@@ -31,6 +36,21 @@ class OrderCreate(BaseModel):
             raise ValueError(f'Order type must be one of: {valid}')
         return v.upper()
 
+    @validator('quantity', 'price', 'stop_price')
+    def normalize_decimal(cls, v):
+        # Bring every amount to the column's 8-dp form once, so the fill path
+        # only ever does arithmetic on short, finite coefficients.
+        if v is None:
+            return v
+        if not v.is_finite() or v <= 0:
+            raise ValueError('Must be a positive number')
+        if v.adjusted() >= _MAX_INT_DIGITS:
+            raise ValueError('Value too large')
+        q = v.quantize(_SCALE)
+        if q != v:
+            raise ValueError('At most 8 decimal places are allowed')
+        return q
+
     @validator('price')
     def validate_price(cls, v, values):
         ot = values.get('order_type', '')
@@ -63,3 +83,8 @@ class OrderOut(BaseModel):
     commission_asset: str
     created_at: str
     updated_at: str
+
+    @validator('created_at', 'updated_at', pre=True)
+    def format_timestamp(cls, v):
+        # List rows carry datetimes; keep the str(datetime) form the API has always sent
+        return str(v) if isinstance(v, datetime) else v
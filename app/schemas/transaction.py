@@ -1,4 +1,5 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, validator
+from datetime import datetime
 from decimal import Decimal
 
 
@@ -13,3 +14,8 @@ class TransactionOut(BaseModel):
     is_maker: bool
     realized_pnl: Decimal
     timestamp: str
+
+    @validator('timestamp', pre=True)
+    def format_timestamp(cls, v):
+        # History rows carry datetimes; keep the str(datetime) form the API has always sent
+        return str(v) if isinstance(v, datetime) else v
@@ -73,11 +73,11 @@ def get_user_achievements(session: Session, user_id: int) -> dict:
     }
 
 
-def check_and_award(session: Session, user_id: int, context: dict = None) -> list:
+def check_and_award(session: Session, user_id: int, context: dict = None, user: User = None) -> list:
     """
     Check all achievement conditions and award new ones.
-    Call this after trades, on login, etc.
-    Returns list of newly unlocked achievement keys.
+    Call this after trades, on login, etc. Pass `user` if the caller already has it loaded.
+    Returns list of newly unlocked achievement keys. Caller commits.
     """
     context = context or {}
     existing = set(
@@ -104,7 +104,7 @@ def check_and_award(session: Session, user_id: int, context: dict = None) -> lis
         select(TradingAccount).where(TradingAccount.user_id == user_id)
     ).first()
 
-    user = session.exec(select(User).where(User.id == user_id)).first()
+    user = user or session.get(User, user_id)
 
     # -- Trade count milestones --
     if trade_count >= 1:
@@ -128,11 +128,10 @@ def check_and_award(session: Session, user_id: int, context: dict = None) -> lis
         if total_profit >= 100000:
             _award("profit_100k")
 
-        total_value = float(account.balance) + sum(
-            float(p.current_value) for p in session.exec(
-                select(Position).where(Position.account_id == account.id)
-            ).all()
-        )
+        positions = session.exec(
+            select(Position).where(Position.account_id == account.id)
+        ).all()
+        total_value = float(account.balance) + sum(float(p.current_value) for p in positions)
         if total_value >= 2000000:
             _award("millionaire")
 
@@ -142,11 +141,7 @@ def check_and_award(session: Session, user_id: int, context: dict = None) -> lis
 
     # -- Diversification --
     if account:
-        position_count = session.exec(
-            select(func.count(Position.id))
-            .where(Position.account_id == account.id)
-        ).one()
-        if position_count >= 3:
+        if len(positions) >= 3:
             _award("diversified")
 
     # -- Streak --
@@ -159,13 +154,11 @@ def check_and_award(session: Session, user_id: int, context: dict = None) -> lis
             _award("streak_14")
 
     # -- All coins traded --
-    traded_symbols = set(
-        t.symbol for t in session.exec(
-            select(TransactionHistory).where(TransactionHistory.user_id == user_id)
-        ).all()
-    )
-    from app.core.config import settings
-    if traded_symbols >= set(settings.SUPPORTED_SYMBOLS):
+    traded_symbols = set(session.exec(
+        select(TransactionHistory.symbol).where(TransactionHistory.user_id == user_id).distinct()
+    ).all())
+    from app.core.config import SUPPORTED_SYMBOL_SET
+    if traded_symbols >= SUPPORTED_SYMBOL_SET:
         _award("all_coins")
 
     # -- Whale trade --
@@ -185,10 +178,10 @@ def check_and_award(session: Session, user_id: int, context: dict = None) -> lis
         select(Order)
         .where(Order.user_id == user_id, Order.order_type == "LIMIT", Order.order_status.in_(["FILLED", "CANCELLED"]))
         .order_by(Order.updated_at.desc())
+        .limit(5)
     ).all()
     if len(recent_orders) >= 5:
-        last_5 = recent_orders[:5]
-        if all(o.order_status == "FILLED" for o in last_5):
+        if all(o.order_status == "FILLED" for o in recent_orders):
             _award("sniper")
 
     # -- Perfect week (7 profitable trades in a row) --
@@ -196,12 +189,10 @@ def check_and_award(session: Session, user_id: int, context: dict = None) -> lis
         select(TransactionHistory)
         .where(TransactionHistory.user_id == user_id, TransactionHistory.side == "SELL")
         .order_by(TransactionHistory.timestamp.desc())
+        .limit(7)
     ).all()
     if len(recent_sells) >= 7:
-        if all(t.realized_pnl > 0 for t in recent_sells[:7]):
+        if all(t.realized_pnl > 0 for t in recent_sells):
             _award("perfect_week")
 
-    if newly_unlocked:
-        session.commit()
-
     return newly_unlocked
@@ -6,6 +6,7 @@ from sqlmodel import Session, select
 from app.models.database import TransactionHistory, TradingAccount, Position, Order, User
 from app.core.config import settings
 from datetime import datetime, timedelta
+from app.utils.clock import utcnow
 from collections import defaultdict
 
 
@@ -82,7 +83,7 @@ def get_analytics(session: Session, user_id: int) -> dict:
             max_drawdown = dd
 
     # -- Streak info --
-    user = session.exec(select(User).where(User.id == user_id)).first()
+    user = session.get(User, user_id)
 
     return {
         "total_trades": len(txs),
@@ -129,16 +130,18 @@ def _empty_analytics() -> dict:
     }
 
 
-def update_streak(session: Session, user_id: int, realized_pnl: Decimal):
-    """Call after every SELL trade to update profit streak."""
-    user = session.exec(select(User).where(User.id == user_id)).first()
+def update_streak(session: Session, user_id: int, realized_pnl: Decimal, now: datetime = None,
+                  user: User = None):
+    """Call after every SELL trade to update profit streak. Caller commits."""
+    user = user or session.get(User, user_id)
     if not user:
         return
-    today = datetime.utcnow().strftime("%Y-%m-%d")
+    now = now or utcnow()
+    today = now.strftime("%Y-%m-%d")
     if realized_pnl > 0:
         if user.last_profit_date == today:
             return  # already counted today
-        yesterday = (datetime.utcnow() - timedelta(days=1)).strftime("%Y-%m-%d")
+        yesterday = (now - timedelta(days=1)).strftime("%Y-%m-%d")
         if user.last_profit_date == yesterday:
             user.current_streak += 1
         else:
@@ -149,4 +152,3 @@ def update_streak(session: Session, user_id: int, realized_pnl: Decimal):
     else:
         user.current_streak = 0
     session.add(user)
-    session.commit()
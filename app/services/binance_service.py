@@ -1,15 +1,24 @@
-from binance import AsyncClient, BinanceSocketManager
 from app.core.config import settings
 from fastapi import HTTPException
 from decimal import Decimal
 import asyncio
-from typing import Optional
+import time
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 
-_client: Optional[AsyncClient] = None
+if TYPE_CHECKING:
+    from binance import AsyncClient
+
+_client: Optional["AsyncClient"] = None
 _client_lock = asyncio.Lock()
 
+# symbol -> (fetched_at monotonic, price). Prices this fresh don't change fill logic.
+PRICE_CACHE_TTL = 0.2
+_price_cache: Dict[str, Tuple[float, Decimal]] = {}
+# symbol -> in-flight ticker fetch shared by concurrent cache misses
+_inflight: Dict[str, asyncio.Task] = {}
+
 
-async def get_client() -> AsyncClient:
+async def get_client() -> "AsyncClient":
     global _client
     if _client is not None:
         return _client
@@ -17,6 +26,9 @@ async def get_client() -> AsyncClient:
         # Double-check after acquiring lock
         if _client is not None:
             return _client
+        # python-binance is slow to import (~0.6s, mostly dateparser); load it
+        # on first use so importing the services doesn't pay for it.
+        from binance import AsyncClient
         _client = await AsyncClient.create(
             api_key=settings.BINANCE_API_KEY or "",
             api_secret=settings.BINANCE_API_SECRET or "",
@@ -32,9 +44,25 @@ async def close_client():
 
 
 async def get_current_price(symbol: str) -> Decimal:
+    cached = _price_cache.get(symbol)
+    if cached and time.monotonic() - cached[0] < PRICE_CACHE_TTL:
+        return cached[1]
+    # Single-flight: a burst of orders on one symbol makes ONE REST call
+    task = _inflight.get(symbol)
+    if task is None:
+        task = asyncio.create_task(_fetch_price(symbol))
+        _inflight[symbol] = task
+        task.add_done_callback(lambda _: _inflight.pop(symbol, None))
+    # shield: a cancelled waiter must not cancel the fetch others await
+    return await asyncio.shield(task)
+
+
+async def _fetch_price(symbol: str) -> Decimal:
     try:
         client = await get_client()
         ticker = await client.get_symbol_ticker(symbol=symbol)
-        return Decimal(ticker['price'])
+        price = Decimal(ticker['price'])
+        _price_cache[symbol] = (time.monotonic(), price)
+        return price
     except Exception as e:
         raise HTTPException(status_code=503, detail=f"Binance API error: {str(e)}")
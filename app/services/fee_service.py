@@ -10,14 +10,31 @@ from sqlmodel import Session, select
 from app.models.database import TradingAccount
 from app.core.config import settings
 
+# Parsed once at import: (min_volume, tier, maker_rate, taker_rate), rates as fractions
+_TIERS = [
+    (
+        Decimal(str(t["min_volume"])), t,
+        Decimal(t["maker"]) / Decimal('100'), Decimal(t["taker"]) / Decimal('100'),
+    )
+    for t in settings.FEE_TIERS
+]
+# label -> (maker %, taker %) as shown by get_fee_info
+_TIER_PERCENTS = {t["label"]: (Decimal(t["maker"]), Decimal(t["taker"])) for t in settings.FEE_TIERS}
+_BNB_FACTOR = Decimal('1') - Decimal(str(settings.BNB_FEE_DISCOUNT))
+_FEE_QUANT = Decimal('0.00000001')
+
+
+def _tier_entry(volume_30d: Decimal) -> tuple:
+    entry = _TIERS[0]
+    for e in _TIERS:
+        if volume_30d >= e[0]:
+            entry = e
+    return entry
+
 
 def get_fee_tier(volume_30d: Decimal) -> dict:
     """Determine fee tier based on 30-day trading volume."""
-    tier = settings.FEE_TIERS[0]
-    for t in settings.FEE_TIERS:
-        if volume_30d >= Decimal(str(t["min_volume"])):
-            tier = t
-    return tier
+    return _tier_entry(volume_30d)[1]
 
 
 def calculate_fee(
@@ -30,9 +47,8 @@ def calculate_fee(
     Calculate fee like Binance.
     Returns: (fee_amount, fee_rate, fee_asset, is_bnb_discount)
     """
-    tier = get_fee_tier(account.trading_volume_30d)
-    rate_str = tier["maker"] if is_maker else tier["taker"]
-    fee_rate = Decimal(rate_str) / Decimal('100')  # Convert percentage to decimal
+    _, _, maker_rate, taker_rate = _tier_entry(account.trading_volume_30d)
+    fee_rate = maker_rate if is_maker else taker_rate
 
     notional = price * quantity
     fee = notional * fee_rate
@@ -41,12 +57,11 @@ def calculate_fee(
     is_bnb_discount = False
     fee_asset = "USDT"
     if account.use_bnb_fee:
-        discount = Decimal(str(settings.BNB_FEE_DISCOUNT))
-        fee = fee * (Decimal('1') - discount)
+        fee = fee * _BNB_FACTOR
         is_bnb_discount = True
         fee_asset = "USDT(BNB)"  # Marks BNB discount was applied
 
-    fee = fee.quantize(Decimal('0.00000001'), rounding=ROUND_DOWN)
+    fee = fee.quantize(_FEE_QUANT, rounding=ROUND_DOWN)
     return fee, fee_rate, fee_asset, is_bnb_discount
 
 
@@ -61,12 +76,10 @@ def update_trading_volume(session: Session, account: TradingAccount, notional: D
 def get_fee_info(account: TradingAccount) -> dict:
     """Return current fee tier info for display."""
     tier = get_fee_tier(account.trading_volume_30d)
-    maker = Decimal(tier["maker"])
-    taker = Decimal(tier["taker"])
+    maker, taker = _TIER_PERCENTS[tier["label"]]
     if account.use_bnb_fee:
-        discount = Decimal(str(settings.BNB_FEE_DISCOUNT))
-        maker = maker * (Decimal('1') - discount)
-        taker = taker * (Decimal('1') - discount)
+        maker = maker * _BNB_FACTOR
+        taker = taker * _BNB_FACTOR
     return {
         "tier": tier["label"],
         "maker_fee": str(maker) + "%",
@@ -3,49 +3,63 @@ Leaderboard — rank users by profit, win rate, streak.
 """
 from decimal import Decimal
 from sqlmodel import Session, select, func
+from sqlalchemy import and_, case
 from app.models.database import User, TradingAccount, Position, TransactionHistory, UserAchievement
 from app.core.config import settings
 
+_INITIAL_BALANCE = Decimal(str(settings.INITIAL_BALANCE))
+
 
 def get_leaderboard(session: Session, sort_by: str = "profit") -> list:
     """
     Rank all users. sort_by: profit | return_rate | streak | achievements
     """
-    users = session.exec(select(User).where(User.is_active == True)).all()
-    initial = Decimal(str(settings.INITIAL_BALANCE))
-
-    entries = []
-    for user in users:
-        account = session.exec(
-            select(TradingAccount).where(TradingAccount.user_id == user.id)
-        ).first()
-        if not account:
-            continue
+    initial = _INITIAL_BALANCE
 
-        positions = session.exec(
-            select(Position).where(Position.account_id == account.id)
-        ).all()
-        total_value = account.balance + sum(p.current_value for p in positions)
-        return_rate = float((total_value - initial) / initial * 100) if initial > 0 else 0
+    # Per-account / per-user aggregates, computed by the database in one pass
+    # each instead of 4 queries per user.
+    position_value = (
+        select(Position.account_id, func.sum(Position.current_value).label("value"))
+        .group_by(Position.account_id)
+        .subquery()
+    )
+    trade_stats = (
+        select(
+            TransactionHistory.user_id,
+            func.count(TransactionHistory.id).label("trades"),
+            func.sum(case((TransactionHistory.side == "SELL", 1), else_=0)).label("sells"),
+            func.sum(case(
+                (and_(TransactionHistory.side == "SELL", TransactionHistory.realized_pnl > 0), 1),
+                else_=0,
+            )).label("wins"),
+        )
+        .group_by(TransactionHistory.user_id)
+        .subquery()
+    )
+    achievement_counts = (
+        select(UserAchievement.user_id, func.count(UserAchievement.id).label("achievements"))
+        .group_by(UserAchievement.user_id)
+        .subquery()
+    )
 
-        trade_count = session.exec(
-            select(func.count(TransactionHistory.id))
-            .where(TransactionHistory.user_id == user.id)
-        ).one()
+    rows = session.exec(
+        select(
+            User, TradingAccount, position_value.c.value,
+            trade_stats.c.trades, trade_stats.c.sells, trade_stats.c.wins,
+            achievement_counts.c.achievements,
+        )
+        .join(TradingAccount, TradingAccount.user_id == User.id)
+        .outerjoin(position_value, position_value.c.account_id == TradingAccount.id)
+        .outerjoin(trade_stats, trade_stats.c.user_id == User.id)
+        .outerjoin(achievement_counts, achievement_counts.c.user_id == User.id)
+        .where(User.is_active == True)
+    ).all()
 
-        sell_txs = session.exec(
-            select(TransactionHistory).where(
-                TransactionHistory.user_id == user.id,
-                TransactionHistory.side == "SELL",
-            )
-        ).all()
-        wins = sum(1 for t in sell_txs if t.realized_pnl > 0)
-        win_rate = (wins / len(sell_txs) * 100) if sell_txs else 0
-
-        achievement_count = session.exec(
-            select(func.count(UserAchievement.id))
-            .where(UserAchievement.user_id == user.id)
-        ).one()
+    entries = []
+    for user, account, value, trades, sells, wins, achievements in rows:
+        total_value = account.balance + Decimal(value or 0)
+        return_rate = float((total_value - initial) / initial * 100) if initial > 0 else 0
+        win_rate = ((wins or 0) / sells * 100) if sells else 0
 
         entries.append({
             "user_id": user.id,
@@ -53,11 +67,11 @@ def get_leaderboard(session: Session, sort_by: str = "profit") -> list:
             "total_profit": float(account.total_profit),
             "total_value": float(total_value),
             "return_rate": round(return_rate, 2),
-            "trade_count": trade_count,
+            "trade_count": trades or 0,
             "win_rate": round(win_rate, 1),
             "current_streak": user.current_streak,
             "best_streak": user.best_streak,
-            "achievement_count": achievement_count,
+            "achievement_count": achievements or 0,
         })
 
     # Sort
@@ -3,7 +3,9 @@ Daily Mission system — rotating challenges with bonus rewards.
 """
 from decimal import Decimal
 from datetime import datetime
+from app.utils.clock import utcnow
 from sqlmodel import Session, select
+from sqlalchemy import update
 from app.models.database import UserMission, TradingAccount, TransactionHistory
 import hashlib
 
@@ -28,10 +30,9 @@ DAILY_MISSION_COUNT = 3
 
 def _get_daily_keys(date_str: str) -> list:
     """Deterministic daily mission selection based on date."""
-    keys = sorted(MISSIONS.keys())
     seed = int(hashlib.md5(date_str.encode()).hexdigest(), 16)
     selected = []
-    remaining = list(keys)
+    remaining = sorted(MISSIONS)  # already a fresh list; popped below
     for i in range(DAILY_MISSION_COUNT):
         idx = (seed + i * 7) % len(remaining)
         selected.append(remaining.pop(idx))
@@ -40,7 +41,7 @@ def _get_daily_keys(date_str: str) -> list:
 
 def get_daily_missions(session: Session, user_id: int) -> list:
     """Get today's missions for user, creating them if needed."""
-    today = datetime.utcnow().strftime("%Y-%m-%d")
+    today = utcnow().strftime("%Y-%m-%d")
     daily_keys = _get_daily_keys(today)
 
     existing = session.exec(
@@ -93,9 +94,11 @@ def get_daily_missions(session: Session, user_id: int) -> list:
 
 
 def progress_missions(session: Session, user_id: int, trade_symbol: str, trade_side: str,
-                      trade_notional: float, realized_pnl: float, order_type: str):
-    """Update mission progress after a trade."""
-    today = datetime.utcnow().strftime("%Y-%m-%d")
+                      trade_notional: float, realized_pnl: float, order_type: str,
+                      now: datetime = None):
+    """Update mission progress after a trade. Caller commits."""
+    now = now or utcnow()
+    today = now.strftime("%Y-%m-%d")
     missions = session.exec(
         select(UserMission).where(
             UserMission.user_id == user_id,
@@ -105,8 +108,7 @@ def progress_missions(session: Session, user_id: int, trade_symbol: str, trade_s
     ).all()
 
     # Today's unique symbols traded (filtered in SQL)
-    from datetime import datetime as dt
-    today_start = dt.strptime(today, "%Y-%m-%d")
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
     today_txs = session.exec(
         select(TransactionHistory).where(
             TransactionHistory.user_id == user_id,
@@ -160,39 +162,59 @@ def progress_missions(session: Session, user_id: int, trade_symbol: str, trade_s
                 m.is_completed = True
             session.add(m)
 
-    session.commit()
-
 
 def claim_mission_reward(session: Session, user_id: int, mission_id: int) -> dict:
-    """Claim reward for completed mission."""
-    mission = session.exec(
-        select(UserMission).where(
+    """
+    Claim reward for completed mission. Both writes are conditional UPDATEs
+    computed in SQL, so two concurrent claims can't both pay out and the
+    credit can't overwrite a balance change made by a fill.
+    """
+    reward = session.scalar(
+        update(UserMission)
+        .where(
             UserMission.id == mission_id,
             UserMission.user_id == user_id,
+            UserMission.is_completed == True,  # noqa: E712
+            UserMission.reward_claimed == False,  # noqa: E712
         )
-    ).first()
-
-    if not mission:
-        return {"error": "Mission not found"}
-    if not mission.is_completed:
-        return {"error": "Mission not completed yet"}
-    if mission.reward_claimed:
-        return {"error": "Reward already claimed"}
-
-    account = session.exec(
-        select(TradingAccount).where(TradingAccount.user_id == user_id)
-    ).first()
-    if not account:
+        .values(reward_claimed=True)
+        .returning(UserMission.reward_amount)
+        .execution_options(synchronize_session=False)
+    )
+    if reward is None:
+        session.rollback()
+        return {"error": _claim_error(session, user_id, mission_id)}
+
+    new_balance = session.scalar(
+        update(TradingAccount)
+        .where(TradingAccount.user_id == user_id)
+        # Bump the version so ORM writers holding the old row see a stale copy
+        .values(balance=TradingAccount.balance + reward, version_id=TradingAccount.version_id + 1)
+        .returning(TradingAccount.balance)
+        .execution_options(synchronize_session=False)
+    )
+    if new_balance is None:
+        session.rollback()
         return {"error": "Account not found"}
-
-    account.balance += mission.reward_amount
-    mission.reward_claimed = True
-    session.add(mission)
-    session.add(account)
     session.commit()
 
     return {
         "claimed": True,
-        "reward": float(mission.reward_amount),
-        "new_balance": float(account.balance),
+        "reward": float(reward),
+        "new_balance": float(new_balance),
     }
+
+
+def _claim_error(session: Session, user_id: int, mission_id: int) -> str:
+    """Why a claim didn't apply (only read on the failure path)."""
+    mission = session.exec(
+        select(UserMission).where(
+            UserMission.id == mission_id,
+            UserMission.user_id == user_id,
+        )
+    ).first()
+    if not mission:
+        return "Mission not found"
+    if not mission.is_completed:
+        return "Mission not completed yet"
+    return "Reward already claimed"
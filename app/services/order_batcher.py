@@ -0,0 +1,155 @@
+"""
+Order Batcher
+- Accepted REST orders are queued instead of committed one by one
+- A single consumer takes whatever is queued (up to BATCH_MAX_SIZE) and flushes as
+  soon as the queue is drained; orders arriving during a flush form the next batch
+- Each batch is placed in ONE transaction (one commit / fsync for N orders)
+- Each order runs in its own SAVEPOINT so a rejected order doesn't sink the batch
+- If the batch commit fails, its orders are retried one transaction each
+  (as are orders that failed for non-business reasons, e.g. a stale account)
+"""
+import asyncio
+import logging
+from decimal import Decimal
+from typing import List, Optional, Tuple
+from fastapi import HTTPException
+from sqlmodel import Session
+from app.core.database import begin_write, engine
+from app.schemas.order import OrderCreate
+
+logger = logging.getLogger(__name__)
+
+BATCH_MAX_SIZE = 200
+BATCH_MAX_WAIT = 0.2  # seconds; caps collection while orders keep arriving
+
+_Item = Tuple[int, OrderCreate, Optional[Decimal], asyncio.Future]
+
+
+class OrderBatcher:
+    def __init__(self):
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self):
+        if self._task:
+            return
+        # A fresh queue per start: an asyncio.Queue binds to the first loop that
+        # waits on it, so a stop()/start() on a new loop must not reuse it.
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+        logger.info("Started (max %d orders / %ss)", BATCH_MAX_SIZE, BATCH_MAX_WAIT)
+
+    async def stop(self):
+        if not self._task:
+            return
+        task, self._task = self._task, None
+        task.cancel()
+        try:
+            # Lets _run settle the batch it holds (see there) before we return
+            await task
+        except asyncio.CancelledError:
+            pass
+        # Nothing will drain the queue any more; fail its waiters.
+        while not self._queue.empty():
+            *_, fut = self._queue.get_nowait()
+            if not fut.done():
+                fut.cancel()
+        logger.info("Stopped")
+
+    async def submit(self, user_id: int, order_data: OrderCreate, market_price: Optional[Decimal]):
+        """Queue an order and wait for its batch to commit. Returns the Order or raises its error."""
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((user_id, order_data, market_price, fut))
+        return await fut
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                deadline = loop.time() + BATCH_MAX_WAIT
+                while len(batch) < BATCH_MAX_SIZE and loop.time() < deadline:
+                    if self._queue.empty():
+                        # One loop turn lets requests already in flight enqueue;
+                        # if none did, flush now instead of holding the batch open.
+                        await asyncio.sleep(0)
+                        if self._queue.empty():
+                            break
+                    batch.append(self._queue.get_nowait())
+            except asyncio.CancelledError:
+                # Stopped while collecting: these are off the queue but not placed
+                for *_, fut in batch:
+                    if not fut.done():
+                        fut.cancel()
+                raise
+
+            flush = asyncio.ensure_future(self._flush_batch(batch))
+            try:
+                results = await asyncio.shield(flush)
+            except asyncio.CancelledError:
+                # Stopped mid-flush: the thread commits regardless, so wait for
+                # it and give the submitters the real outcome before exiting.
+                self._resolve(batch, await flush)
+                raise
+            self._resolve(batch, results)
+
+    async def _flush_batch(self, batch: List[_Item]) -> list:
+        try:
+            return await asyncio.to_thread(self._flush, batch)
+        except Exception as e:
+            return [e] * len(batch)
+
+    @staticmethod
+    def _resolve(batch: List[_Item], results: list):
+        for (*_, fut), result in zip(batch, results):
+            if fut.done():
+                continue
+            if isinstance(result, BaseException):
+                fut.set_exception(result)
+            else:
+                fut.set_result(result)
+
+    @staticmethod
+    def _flush(batch: List[_Item]) -> list:
+        """Place every order of the batch in one transaction (blocking, runs in a thread)."""
+        from app.services.order_service import _stage_order, _place_order_with_retry
+
+        results = []
+        with Session(engine, expire_on_commit=False) as session:
+            begin_write(session)
+            for user_id, order_data, market_price, _ in batch:
+                try:
+                    with session.begin_nested():
+                        results.append(_stage_order(session, user_id, order_data, market_price))
+                except Exception as e:
+                    results.append(e)
+            committed = False
+            try:
+                session.commit()
+                committed = True
+                if not any(isinstance(r, Exception) and not isinstance(r, HTTPException) for r in results):
+                    return results
+                # Orders that lost a race (e.g. stale account version) get retried alone
+            except Exception as e:
+                session.rollback()
+                logger.warning("Batch of %d failed, retrying per order: %s", len(batch), e)
+
+        # Per-order fallback: each accepted order gets its own transaction
+        for i, (user_id, order_data, market_price, _) in enumerate(batch):
+            if isinstance(results[i], HTTPException):
+                continue  # rejected on its own merits, not by the batch commit
+            if committed and not isinstance(results[i], Exception):
+                continue  # already placed by the batch commit
+            with Session(engine, expire_on_commit=False) as session:
+                try:
+                    results[i] = _place_order_with_retry(session, user_id, order_data, market_price)
+                except Exception as e:
+                    results[i] = e
+        return results
+
+
+order_batcher = OrderBatcher()
@@ -1,6 +1,11 @@
 from sqlmodel import Session, select
-from app.models.database import Order, Position, TradingAccount, TransactionHistory, PriceAlert
-from app.services.price_engine import price_engine
+from sqlalchemy import and_, bindparam, delete, insert, lambda_stmt, or_
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.models.database import Order, Position, TradingAccount, TransactionHistory, PriceAlert, User
+from app.services.price_engine import price_engine, PRICE_MAX_AGE
 from app.services.binance_service import get_current_price
 from app.services.fee_service import calculate_fee, update_trading_volume, get_fee_info
 from app.services.order_validator import (
@@ -10,96 +15,225 @@ from app.services.order_validator import (
 from decimal import Decimal
 from app.schemas.order import OrderCreate
 from fastapi import HTTPException
-from app.core.config import settings
-from typing import Optional, List
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings, SUPPORTED_SYMBOL_SET
+from app.core.database import begin_write
+from typing import Optional, Tuple
 from datetime import datetime
+from app.utils.clock import utcnow
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Attempts for the DB section of an order when it hits a deadlock,
+# serialization failure, SQLite "database is locked" or a stale account
+# version (another writer updated the balance first).
+_LOCK_RETRIES = 3
+
+_ZERO = Decimal('0')
+_INITIAL_BALANCE = Decimal(str(settings.INITIAL_BALANCE))
+_VALUE_QUANT = Decimal('0.00000001')  # scale of the Numeric(20, 8) price/value columns
+
+
+def _load_account_and_position(session: Session, user_id: int, symbol: str):
+    """
+    Fetch the user's account and its position in `symbol` in ONE round-trip
+    (LEFT OUTER JOIN), row-locking the account FOR UPDATE so every writer of
+    the balance serializes on it. Returns (account, position); either may be None.
+    """
+    # lambda_stmt: the Select is built and cache-keyed once per process;
+    # user_id/symbol are picked up from the closure as bound parameters.
+    stmt = lambda_stmt(
+        lambda: select(TradingAccount, Position)
+        .join(
+            Position,
+            and_(Position.account_id == TradingAccount.id, Position.symbol == symbol),
+            isouter=True,
+        )
+        .where(TradingAccount.user_id == user_id)
+        # Postgres can't lock the nullable side of an outer join; locking the
+        # account is enough since all position writes go through it.
+        .with_for_update(of=TradingAccount)
+    )
+    row = session.execute(stmt).first()
+    return (row[0], row[1]) if row else (None, None)
+
+
+def _load_order_for_fill(session: Session, order_id: int):
+    """
+    Engine-fill variant of _load_account_and_position: re-reads the order
+    together with its account and position in ONE round-trip, locking the
+    order and the account. Returns (order, account, position); all None if
+    the order is gone.
+    """
+    stmt = lambda_stmt(
+        lambda: select(Order, TradingAccount, Position)
+        .join(TradingAccount, TradingAccount.user_id == Order.user_id)
+        .join(
+            Position,
+            and_(Position.account_id == TradingAccount.id, Position.symbol == Order.symbol),
+            isouter=True,
+        )
+        .where(Order.id == order_id)
+        .with_for_update(of=(Order, TradingAccount))
+    )
+    row = session.execute(stmt).first()
+    return (row[0], row[1], row[2]) if row else (None, None, None)
+
+
+# -- Shared error responses --
+# Built per raise: a module-level exception instance would keep accumulating
+# traceback frames every time it is re-raised.
+
+def _unsupported_symbol() -> HTTPException:
+    return HTTPException(status_code=400, detail="Unsupported symbol")
+
+
+def _account_not_found() -> HTTPException:
+    return HTTPException(status_code=404, detail="Account not found")
+
+
+def _insufficient_balance() -> HTTPException:
+    return HTTPException(status_code=400, detail="Insufficient balance")
+
+
+def _insufficient_quantity() -> HTTPException:
+    return HTTPException(status_code=400, detail="Insufficient quantity to sell")
 
 
 async def create_order(session: Session, user_id: int, order_data: OrderCreate) -> Order:
-    if order_data.symbol not in settings.SUPPORTED_SYMBOLS:
-        raise HTTPException(status_code=400, detail="Unsupported symbol")
+    if order_data.symbol not in SUPPORTED_SYMBOL_SET:
+        raise _unsupported_symbol()
 
-    account = session.exec(
-        select(TradingAccount).where(TradingAccount.user_id == user_id)
-    ).first()
+    # Fetch the market price BEFORE touching the DB so no lock is held
+    # across the Binance round-trip. The streamed price is free; fall back to
+    # the (TTL-cached, single-flight) REST ticker only if the stream is stale.
+    market_price = None
+    if order_data.order_type == 'MARKET':
+        market_price = (
+            price_engine.get_price(order_data.symbol, max_age=PRICE_MAX_AGE)
+            or await get_current_price(order_data.symbol)
+        )
+
+    # While the server is up, orders are grouped into shared transactions by
+    # the batcher; otherwise (scripts, tests) they're placed one by one.
+    from app.services.order_batcher import order_batcher
+    if order_batcher.running:
+        return await order_batcher.submit(user_id, order_data, market_price)
+
+    # The DB section is blocking (sync Session); run it in the threadpool so
+    # the event loop keeps serving other requests and price ticks meanwhile.
+    return await run_in_threadpool(_place_order_with_retry, session, user_id, order_data, market_price)
+
+
+def _place_order_with_retry(
+    session: Session, user_id: int, order_data: OrderCreate, market_price: Optional[Decimal],
+) -> Order:
+    for attempt in range(_LOCK_RETRIES):
+        try:
+            return _place_order(session, user_id, order_data, market_price)
+        except (OperationalError, StaleDataError):
+            # Lock conflict / lost race — retry from a clean transaction
+            session.rollback()
+            if attempt == _LOCK_RETRIES - 1:
+                raise
+
+
+def _place_order(
+    session: Session, user_id: int, order_data: OrderCreate, market_price: Optional[Decimal],
+) -> Order:
+    """DB-only critical section of create_order: stage the order, then commit."""
+    # Order insert + fill + hooks form ONE transaction with a single commit
+    try:
+        begin_write(session)
+        order = _stage_order(session, user_id, order_data, market_price)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    return order
+
+
+def _stage_order(
+    session: Session, user_id: int, order_data: OrderCreate, market_price: Optional[Decimal],
+) -> Order:
+    """Lock, validate, insert and (for MARKET) fill an order WITHOUT committing."""
+    now = utcnow()  # one timestamp for every row this order writes
+    # OrderCreate already canonicalized these to upper-case strings
+    symbol, side, order_type = order_data.symbol, order_data.side, order_data.order_type
+    quantity, price = order_data.quantity, order_data.price
+    account, position = _load_account_and_position(session, user_id, symbol)
     if not account:
-        raise HTTPException(status_code=404, detail="Account not found")
+        raise _account_not_found()
 
     # -- Binance-style validation --
-    validate_quantity(order_data.symbol, order_data.quantity)
-    if order_data.price is not None:
-        validate_price(order_data.symbol, order_data.price)
+    validate_quantity(symbol, quantity)
+    if price is not None:
+        validate_price(symbol, price)
 
     # Estimate price for notional check
-    if order_data.order_type == 'MARKET':
-        est_price = price_engine.get_price(order_data.symbol)
-        if est_price is None:
-            est_price = await get_current_price(order_data.symbol)
-    else:
-        est_price = order_data.price
+    est_price = market_price if order_type == 'MARKET' else price
 
     if est_price:
-        validate_min_notional(order_data.symbol, est_price, order_data.quantity)
+        validate_min_notional(symbol, est_price, quantity)
 
     # -- Pre-validate balance / position BEFORE creating order --
-    if order_data.side == 'BUY':
-        is_maker = order_data.order_type != 'MARKET'
-        est_fee, _, _, _ = calculate_fee(est_price, order_data.quantity, is_maker, account)
-        est_cost = est_price * order_data.quantity + est_fee
+    if side == 'BUY':
+        is_maker = order_type != 'MARKET'
+        est_fee, _, _, _ = calculate_fee(est_price, quantity, is_maker, account)
+        est_cost = est_price * quantity + est_fee
         if account.balance < est_cost:
-            raise HTTPException(status_code=400, detail="Insufficient balance")
+            raise _insufficient_balance()
 
-    if order_data.side == 'SELL':
-        position = session.exec(
-            select(Position).where(
-                Position.account_id == account.id,
-                Position.symbol == order_data.symbol,
-            )
-        ).first()
-        if not position or position.quantity < order_data.quantity:
-            raise HTTPException(status_code=400, detail="Insufficient quantity to sell")
+    if side == 'SELL':
+        if not position or position.quantity < quantity:
+            raise _insufficient_quantity()
 
     # -- Create order + execute in single transaction --
     order = Order(
         user_id=user_id,
-        symbol=order_data.symbol,
-        side=order_data.side,
-        order_type=order_data.order_type,
-        quantity=order_data.quantity,
-        price=order_data.price,
+        symbol=symbol,
+        side=side,
+        order_type=order_type,
+        quantity=quantity,
+        price=price,
         stop_price=order_data.stop_price,
+        created_at=now, updated_at=now,
     )
 
-    if order.order_type == 'MARKET':
-        current = price_engine.get_price(order.symbol) or await get_current_price(order.symbol)
-        fill_price = simulate_slippage(current, order.side)
-        fill_price = round_price(order.symbol, fill_price)
+    if order_type == 'MARKET':
+        fill_price = simulate_slippage(market_price, side)
+        fill_price = round_price(symbol, fill_price)
         is_maker = False
-        fee, _, fee_asset, _ = calculate_fee(fill_price, order.quantity, is_maker, account)
-
-        # All state changes in one commit
-        session.add(order)
-        session.flush()  # get order.id
-        _apply_fill(session, order, account, order.quantity, fill_price, fee, fee_asset, is_maker)
-        session.commit()
-        session.refresh(order)
-    else:
-        # LIMIT / STOP orders stay PENDING
-        session.add(order)
-        session.commit()
-        session.refresh(order)
+        fee, _, fee_asset, _ = calculate_fee(fill_price, quantity, is_maker, account)
 
+    session.add(order)
+    if order_type == 'MARKET':
+        _apply_fill(session, order, account, position, quantity, fill_price, fee, fee_asset, is_maker, now)
+    # LIMIT / STOP orders stay PENDING
     return order
 
 
+_INSERT_TRANSACTION = insert(TransactionHistory.__table__)
+
+
 def _apply_fill(
-    session: Session, order: Order, account: TradingAccount,
+    session: Session, order: Order, account: TradingAccount, position: Optional[Position],
     qty: Decimal, fill_price: Decimal, fee: Decimal, fee_asset: str, is_maker: bool,
+    now: datetime,
 ):
     """
     Core fill logic — applies all state changes WITHOUT committing.
     Caller is responsible for session.commit().
+    `position` is the account's already-loaded position in order.symbol (or None).
+    `now` stamps the order, the transaction row and the hooks alike.
+
+    All in-memory changes are made before the first flush so each row is
+    written once: a new MARKET order is INSERTed already FILLED and the
+    account gets a single UPDATE, instead of INSERT-then-UPDATE pairs.
     """
+    # Store the price at column scale so the response matches what reads return
+    fill_price = fill_price.quantize(_VALUE_QUANT)
     notional = fill_price * qty
 
     # -- Update order --
@@ -108,189 +242,323 @@ def _apply_fill(
     order.commission += fee
     order.commission_asset = fee_asset
     order.order_status = 'FILLED' if order.filled_quantity >= order.quantity else 'PARTIALLY_FILLED'
-    order.updated_at = datetime.utcnow()
-    session.add(order)
-
-    # -- Get or create position --
-    position = session.exec(
-        select(Position).where(Position.account_id == account.id, Position.symbol == order.symbol)
-    ).first()
-    if not position:
-        position = Position(
-            account_id=account.id, symbol=order.symbol,
-            quantity=Decimal('0'), average_price=Decimal('0'),
-            current_value=Decimal('0'), unrealized_profit=Decimal('0'),
-            total_cost=Decimal('0'),
-        )
-        session.add(position)
-        session.flush()
-
-    realized_pnl = Decimal('0')
-
-    if order.side == 'BUY':
-        total_buy_cost = notional + fee
-        # Balance already validated before this point, but double-check
-        if account.balance < total_buy_cost:
-            raise HTTPException(status_code=400, detail="Insufficient balance")
-
-        new_qty = position.quantity + qty
-        position.total_cost += total_buy_cost
-        position.quantity = new_qty
-        position.average_price = position.total_cost / new_qty if new_qty > 0 else Decimal('0')
-        account.balance -= total_buy_cost
-
-    elif order.side == 'SELL':
-        if position.quantity < qty:
-            raise HTTPException(status_code=400, detail="Insufficient quantity to sell")
-
-        sell_proceeds = notional - fee
-        cost_basis = position.average_price * qty
-        realized_pnl = sell_proceeds - cost_basis
-        account.total_profit += realized_pnl
-        account.balance += sell_proceeds
-
-        position.quantity -= qty
-        # Reduce total_cost proportionally
-        if position.quantity > Decimal('0'):
-            position.total_cost = position.average_price * position.quantity
-        else:
-            position.total_cost = Decimal('0')
-
-    # Update current value
-    position.current_value = position.quantity * fill_price
-    position.unrealized_profit = (
-        position.quantity * (fill_price - position.average_price)
-        if position.quantity > 0 else Decimal('0')
-    )
+    order.updated_at = now
 
-    if position.quantity <= Decimal('0'):
-        session.delete(position)
-    else:
-        session.add(position)
+    # order/account/position are already in the session (staged or loaded
+    # for update), so no session.add(): that would only re-walk the cascades.
 
-    # Update trading volume for fee tier
+    # Update trading volume for fee tier (this fill's fee is already priced)
     update_trading_volume(session, account, notional)
-    session.add(account)
+
+    settle = _fill_buy if order.side == 'BUY' else _fill_sell
+    realized_pnl = settle(session, order, account, position, qty, fill_price, notional, fee)
 
     # -- Record transaction --
-    tx = TransactionHistory(
-        user_id=order.user_id, order_id=order.id, symbol=order.symbol,
-        side=order.side, quantity=qty, price=fill_price,
-        fee=fee, fee_asset=fee_asset, is_maker=is_maker,
-        realized_pnl=realized_pnl,
-    )
-    session.add(tx)
+    if order.id is None:
+        session.flush()  # INSERT the new order (already filled) to get its id
+    # Core INSERT: the row is never read back as an object, so skip the
+    # unit-of-work bookkeeping an ORM instance would need
+    session.execute(_INSERT_TRANSACTION, {
+        "user_id": order.user_id, "order_id": order.id, "symbol": order.symbol,
+        "side": order.side, "quantity": qty, "price": fill_price,
+        "fee": fee, "fee_asset": fee_asset, "is_maker": is_maker,
+        "realized_pnl": realized_pnl, "timestamp": now,
+    })
 
     # -- Post-trade hooks (streak, achievements, missions) --
-    _run_post_trade_hooks(session, order, notional, realized_pnl)
-
-
-def _run_post_trade_hooks(session: Session, order: Order, notional: Decimal, realized_pnl: Decimal):
-    """Run streak/achievement/mission updates. Errors here don't break the trade."""
+    _run_post_trade_hooks(session, order, notional, realized_pnl, now)
+
+
+def _fill_buy(
+    session: Session, order: Order, account: TradingAccount, position: Optional[Position],
+    qty: Decimal, fill_price: Decimal, notional: Decimal, fee: Decimal,
+) -> Decimal:
+    """BUY half of _apply_fill: debit the balance, add to the position. Returns realized PnL."""
+    total_buy_cost = notional + fee
+    balance = account.balance
+    # Balance already validated before this point, but double-check
+    if balance < total_buy_cost:
+        raise _insufficient_balance()
+
+    account.balance = balance - total_buy_cost
+    _upsert_buy_position(session, account.id, order.symbol, qty, total_buy_cost, fill_price)
+    return _ZERO
+
+
+def _fill_sell(
+    session: Session, order: Order, account: TradingAccount, position: Optional[Position],
+    qty: Decimal, fill_price: Decimal, notional: Decimal, fee: Decimal,
+) -> Decimal:
+    """SELL half of _apply_fill: credit proceeds, reduce or close the position. Returns realized PnL."""
+    if position is None:
+        raise _insufficient_quantity()
+    # Settle on plain locals: each ORM attribute read/write goes through
+    # instrumentation, so touch every column once.
+    held = position.quantity
+    if held < qty:
+        raise _insufficient_quantity()
+    avg_price = position.average_price
+
+    sell_proceeds = notional - fee
+    realized_pnl = sell_proceeds - avg_price * qty
+    account.total_profit += realized_pnl
+    account.balance += sell_proceeds
+
+    remaining = held - qty
+    if remaining <= _ZERO:
+        # Direct DELETE by key instead of a unit-of-work delete; "evaluate"
+        # still marks the loaded instance as deleted in this session.
+        session.execute(
+            delete(Position).where(Position.id == position.id)
+            .execution_options(synchronize_session="evaluate")
+        )
+    else:
+        # Reduce total_cost proportionally, revalue at the fill price
+        position.quantity = remaining
+        position.total_cost = avg_price * remaining
+        position.current_value = remaining * fill_price
+        position.unrealized_profit = remaining * (fill_price - avg_price)
+    return realized_pnl
+
+
+def _upsert_buy_position(
+    session: Session, account_id: int, symbol: str,
+    qty: Decimal, cost: Decimal, fill_price: Decimal,
+) -> Position:
+    """
+    Add a BUY fill to the (account, symbol) position in ONE atomic statement:
+    INSERT ... ON CONFLICT (account_id, symbol) DO UPDATE ... RETURNING.
+    The database recomputes quantity/total_cost/average_price from the row's
+    current values, so there's no SELECT-then-INSERT race on a new symbol.
+    SQLite and PostgreSQL share this syntax.
+    """
+    dialect_insert = pg_insert if session.get_bind().dialect.name == "postgresql" else sqlite_insert
+    ins = dialect_insert(Position).values(
+        account_id=account_id, symbol=symbol,
+        quantity=qty, total_cost=cost, average_price=cost / qty,
+        current_value=qty * fill_price, unrealized_profit=qty * fill_price - cost,
+    )
+    new_qty = Position.quantity + ins.excluded.quantity
+    new_cost = Position.total_cost + ins.excluded.total_cost
+    new_avg = new_cost / new_qty
+    stmt = ins.on_conflict_do_update(
+        index_elements=["account_id", "symbol"],
+        set_={
+            "quantity": new_qty,
+            "total_cost": new_cost,
+            "average_price": new_avg,
+            "current_value": new_qty * fill_price,
+            "unrealized_profit": new_qty * (fill_price - new_avg),
+        },
+    ).returning(Position)
+    # populate_existing refreshes the already-loaded instance, if any
+    return session.scalars(stmt, execution_options={"populate_existing": True}).one()
+
+
+def _run_post_trade_hooks(
+    session: Session, order: Order, notional: Decimal, realized_pnl: Decimal, now: datetime,
+):
+    """
+    Run streak/achievement/mission updates inside a SAVEPOINT of the trade's
+    transaction. Errors here roll back only the hooks, never the trade.
+    """
     try:
         from app.services.analytics_service import update_streak
         from app.services.achievement_service import check_and_award
         from app.services.mission_service import progress_missions
 
-        if order.side == 'SELL':
-            update_streak(session, order.user_id, realized_pnl)
-
-        check_and_award(session, order.user_id, {
-            "trade_notional": float(notional),
-            "trade_hour": datetime.utcnow().hour,
-        })
-
-        progress_missions(
-            session, order.user_id,
-            trade_symbol=order.symbol, trade_side=order.side,
-            trade_notional=float(notional), realized_pnl=float(realized_pnl),
-            order_type=order.order_type,
-        )
+        with session.begin_nested():
+            # Load the user once and hand it to every hook that needs it
+            user = session.get(User, order.user_id)
+            if order.side == 'SELL':
+                update_streak(session, order.user_id, realized_pnl, now, user=user)
+
+            check_and_award(session, order.user_id, {
+                "trade_notional": float(notional),
+                "trade_hour": now.hour,
+            }, user=user)
+
+            progress_missions(
+                session, order.user_id,
+                trade_symbol=order.symbol, trade_side=order.side,
+                trade_notional=float(notional), realized_pnl=float(realized_pnl),
+                order_type=order.order_type, now=now,
+            )
     except Exception as e:
-        print(f"[PostTrade] Hook error: {e}")
+        logger.warning("Post-trade hook error: %s", e)
 
 
 def cancel_order(session: Session, user_id: int, order_id: int) -> Order:
-    order = session.exec(
-        select(Order).where(Order.id == order_id, Order.user_id == user_id)
-    ).first()
-    if not order:
+    order = session.get(Order, order_id)
+    if not order or order.user_id != user_id:
         raise HTTPException(status_code=404, detail="Order not found")
     if order.order_status != 'PENDING':
         raise HTTPException(status_code=400, detail="Only pending orders can be cancelled")
     order.order_status = 'CANCELLED'
-    order.updated_at = datetime.utcnow()
+    order.updated_at = utcnow()
     session.add(order)
     session.commit()
-    session.refresh(order)
     return order
 
 
 # -- Query helpers --
 
-def get_user_orders(session: Session, user_id: int) -> List[Order]:
+# Columns the order / transaction list endpoints serialize. Selecting them as
+# plain rows skips ORM instance construction and identity-map bookkeeping.
+_ORDER_LIST_COLUMNS = (
+    Order.id, Order.symbol, Order.side, Order.order_type, Order.quantity,
+    Order.price, Order.stop_price, Order.order_status, Order.filled_quantity,
+    Order.filled_price, Order.commission, Order.commission_asset,
+    Order.created_at, Order.updated_at,
+)
+_TX_LIST_COLUMNS = (
+    TransactionHistory.id, TransactionHistory.symbol, TransactionHistory.side,
+    TransactionHistory.quantity, TransactionHistory.price, TransactionHistory.fee,
+    TransactionHistory.fee_asset, TransactionHistory.is_maker,
+    TransactionHistory.realized_pnl, TransactionHistory.timestamp,
+)
+
+
+def _keyset_page(session: Session, query, ts_col, id_col, limit: int,
+                 before: Optional[datetime], before_id: Optional[int]) -> list:
+    """
+    Newest-first page of `query` after the cursor (before, before_id).
+    The id breaks timestamp ties, so rows sharing a timestamp across a page
+    boundary are neither skipped nor repeated. A cursor without an id
+    falls back to a plain `ts < before`.
+    """
+    if before is not None:
+        if before_id is None:
+            query = query.where(ts_col < before)
+        else:
+            query = query.where(or_(ts_col < before, and_(ts_col == before, id_col < before_id)))
+    return session.exec(query.order_by(ts_col.desc(), id_col.desc()).limit(limit)).all()
+
+
+def get_user_orders(
+    session: Session, user_id: int, limit: int = 100,
+    before: Optional[datetime] = None, before_id: Optional[int] = None,
+) -> Tuple[list, Optional[datetime]]:
+    """
+    One page of the user's orders (as column rows), newest first,
+    keyset-paginated on the (user_id, created_at) index. Returns
+    (rows, next_cursor); pass the cursor and the last row's id back as
+    `before` / `before_id` for the next page. Cursor is None on the last page.
+    """
+    query = select(*_ORDER_LIST_COLUMNS).where(Order.user_id == user_id)
+    orders = _keyset_page(session, query, Order.created_at, Order.id, limit, before, before_id)
+    next_cursor = orders[-1].created_at if len(orders) == limit else None
+    return orders, next_cursor
+
+
+def get_open_orders(session: Session, user_id: int) -> list:
+    """
+    All of the user's PENDING orders (as column rows), newest first. Not
+    paginated: every open order must stay reachable (and cancellable) no
+    matter how much history sits in front of it in get_user_orders.
+    """
     return session.exec(
-        select(Order).where(Order.user_id == user_id).order_by(Order.created_at.desc())
+        select(*_ORDER_LIST_COLUMNS)
+        .where(Order.user_id == user_id, Order.order_status == 'PENDING')
+        .order_by(Order.created_at.desc(), Order.id.desc())
     ).all()
 
 
-def _position_to_dict(p: Position) -> dict:
+def _position_to_dict(p) -> dict:
+    """`p` is a Position or a row with its columns."""
+    # Mark to the engine's live stream price (a dict read) when it's fresh;
+    # the stored columns are only revalued every POSITION_UPDATE_INTERVAL.
+    price = price_engine.get_price(p.symbol, max_age=PRICE_MAX_AGE)
+    if price is None:
+        current_value, unrealized_profit = p.current_value, p.unrealized_profit
+    else:
+        current_value = (p.quantity * price).quantize(_VALUE_QUANT)
+        unrealized_profit = (p.quantity * (price - p.average_price)).quantize(_VALUE_QUANT)
     return {
         "symbol": p.symbol,
         "quantity": p.quantity,
         "average_price": p.average_price,
-        "current_value": p.current_value,
-        "unrealized_profit": p.unrealized_profit,
+        "current_value": current_value,
+        "unrealized_profit": unrealized_profit,
         "total_cost": p.total_cost,
     }
 
 
+# Read-path statements built once; executions only bind the parameters.
+_SELECT_ACCOUNT_BY_USER = select(TradingAccount).where(TradingAccount.user_id == bindparam("uid"))
+# Account and all its positions in one round-trip, as plain column rows (the
+# summary is read-only, so nothing goes through the identity map). The
+# position columns are NULL when the account holds none.
+_SELECT_ACCOUNT_WITH_POSITIONS = (
+    select(
+        TradingAccount.balance, TradingAccount.total_profit,
+        TradingAccount.trading_volume_30d, TradingAccount.use_bnb_fee,
+        Position.symbol, Position.quantity, Position.average_price,
+        Position.current_value, Position.unrealized_profit, Position.total_cost,
+    )
+    .join(Position, Position.account_id == TradingAccount.id, isouter=True)
+    .where(TradingAccount.user_id == bindparam("uid"))
+)
+
+
 def get_account_summary(session: Session, user_id: int) -> dict:
-    account = session.exec(
-        select(TradingAccount).where(TradingAccount.user_id == user_id)
-    ).first()
-    if not account:
-        raise HTTPException(status_code=404, detail="Account not found")
-    positions = session.exec(
-        select(Position).where(Position.account_id == account.id)
-    ).all()
-    total_value = account.balance + sum(p.current_value for p in positions)
-    initial = Decimal(str(settings.INITIAL_BALANCE))
-    profit_rate = ((total_value - initial) / initial * 100) if initial > 0 else Decimal('0')
+    rows = session.execute(_SELECT_ACCOUNT_WITH_POSITIONS, {"uid": user_id}).all()
+    if not rows:
+        raise _account_not_found()
+    account = rows[0]  # the account columns repeat on every row
+    position_dicts = [_position_to_dict(p) for p in rows if p.symbol is not None]
+    total_value = account.balance + sum(p["current_value"] for p in position_dicts)
+    initial = _INITIAL_BALANCE
+    profit_rate = ((total_value - initial) / initial * 100) if initial > 0 else _ZERO
     return {
         "balance": account.balance,
         "total_profit": account.total_profit,
-        "positions": [_position_to_dict(p) for p in positions],
+        "positions": position_dicts,
         "profit_rate": profit_rate,
         "total_value": total_value,
         "fee_info": get_fee_info(account),
     }
 
 
-def get_transaction_history(session: Session, user_id: int) -> List[TransactionHistory]:
-    return session.exec(
-        select(TransactionHistory).where(TransactionHistory.user_id == user_id)
-        .order_by(TransactionHistory.timestamp.desc())
-    ).all()
+def get_transaction_history(
+    session: Session, user_id: int, limit: int = 100,
+    before: Optional[datetime] = None, before_id: Optional[int] = None,
+) -> Tuple[list, Optional[datetime]]:
+    """
+    One page of the user's transactions (as column rows), newest first,
+    keyset-paginated on the (user_id, timestamp) index like get_user_orders.
+    Returns (rows, next_cursor); cursor is None on the last page.
+    """
+    query = select(*_TX_LIST_COLUMNS).where(TransactionHistory.user_id == user_id)
+    txs = _keyset_page(
+        session, query, TransactionHistory.timestamp, TransactionHistory.id, limit, before, before_id,
+    )
+    next_cursor = txs[-1].timestamp if len(txs) == limit else None
+    return txs, next_cursor
 
 
 def toggle_bnb_fee(session: Session, user_id: int, use_bnb: bool) -> dict:
-    account = session.exec(
-        select(TradingAccount).where(TradingAccount.user_id == user_id)
-    ).first()
-    if not account:
-        raise HTTPException(status_code=404, detail="Account not found")
-    account.use_bnb_fee = use_bnb
-    session.add(account)
-    session.commit()
-    return get_fee_info(account)
+    for attempt in range(_LOCK_RETRIES):
+        account = session.scalar(_SELECT_ACCOUNT_BY_USER, {"uid": user_id})
+        if not account:
+            raise _account_not_found()
+        account.use_bnb_fee = use_bnb
+        session.add(account)
+        try:
+            session.commit()
+            return get_fee_info(account)
+        except StaleDataError:
+            # A fill bumped the account version since we read it
+            session.rollback()
+            if attempt == _LOCK_RETRIES - 1:
+                raise
 
 
 # -- Price Alert helpers --
 
 def create_price_alert(session, user_id, symbol, target_price, condition, memo=""):
-    if symbol not in settings.SUPPORTED_SYMBOLS:
-        raise HTTPException(status_code=400, detail="Unsupported symbol")
+    if symbol not in SUPPORTED_SYMBOL_SET:
+        raise _unsupported_symbol()
     if condition not in ('ABOVE', 'BELOW'):
         raise HTTPException(status_code=400, detail="Condition must be ABOVE or BELOW")
     alert = PriceAlert(
@@ -298,8 +566,7 @@ def create_price_alert(session, user_id, symbol, target_price, condition, memo="
         target_price=target_price, condition=condition, memo=memo,
     )
     session.add(alert)
-    session.commit()
-    session.refresh(alert)
+    session.commit()  # id assigned on flush; expire_on_commit=False keeps it loaded
     return alert
 
 
@@ -311,10 +578,8 @@ def get_user_alerts(session, user_id):
 
 
 def delete_price_alert(session, user_id, alert_id):
-    alert = session.exec(
-        select(PriceAlert).where(PriceAlert.id == alert_id, PriceAlert.user_id == user_id)
-    ).first()
-    if not alert:
+    alert = session.get(PriceAlert, alert_id)
+    if not alert or alert.user_id != user_id:
         raise HTTPException(status_code=404, detail="Alert not found")
     session.delete(alert)
     session.commit()
@@ -4,8 +4,17 @@ Binance-style order validation: stepSize, minQty, minNotional, tickSize, slippag
 from decimal import Decimal, ROUND_DOWN
 from fastapi import HTTPException
 from app.core.config import settings
+from functools import lru_cache
 import random
 
+_MAX_SLIPPAGE_BPS = float(settings.SLIPPAGE_BPS)
+
+_ZERO = Decimal('0')
+_ONE = Decimal('1')
+_BPS_PER_UNIT = Decimal('10000')
+# 0.0001 bps = 1e-8 of the price, finer than any tick the fill is rounded to
+_SLIPPAGE_STEP = Decimal('0.0001')
+
 
 def get_symbol_rules(symbol: str) -> dict:
     rules = settings.SYMBOL_RULES.get(symbol)
@@ -14,11 +23,18 @@ def get_symbol_rules(symbol: str) -> dict:
     return rules
 
 
+@lru_cache(maxsize=None)
+def _decimal_rules(symbol: str) -> dict:
+    """Symbol rules parsed to Decimal once per symbol instead of on every order."""
+    rules = get_symbol_rules(symbol)
+    return {k: Decimal(rules[k]) for k in ("stepSize", "minQty", "minNotional", "tickSize")}
+
+
 def validate_quantity(symbol: str, quantity: Decimal):
     """Validate quantity against Binance LOT_SIZE filter."""
-    rules = get_symbol_rules(symbol)
-    min_qty = Decimal(rules["minQty"])
-    step_size = Decimal(rules["stepSize"])
+    rules = _decimal_rules(symbol)
+    min_qty = rules["minQty"]
+    step_size = rules["stepSize"]
 
     if quantity < min_qty:
         raise HTTPException(
@@ -28,7 +44,7 @@ def validate_quantity(symbol: str, quantity: Decimal):
 
     # Check stepSize: (quantity - minQty) % stepSize == 0
     remainder = (quantity - min_qty) % step_size
-    if remainder != Decimal('0'):
+    if remainder != _ZERO:
         corrected = quantity.quantize(step_size, rounding=ROUND_DOWN)
         raise HTTPException(
             status_code=400,
@@ -38,11 +54,10 @@ def validate_quantity(symbol: str, quantity: Decimal):
 
 def validate_price(symbol: str, price: Decimal):
     """Validate price against Binance PRICE_FILTER."""
-    rules = get_symbol_rules(symbol)
-    tick_size = Decimal(rules["tickSize"])
+    tick_size = _decimal_rules(symbol)["tickSize"]
 
     remainder = price % tick_size
-    if remainder != Decimal('0'):
+    if remainder != _ZERO:
         corrected = price.quantize(tick_size, rounding=ROUND_DOWN)
         raise HTTPException(
             status_code=400,
@@ -52,8 +67,7 @@ def validate_price(symbol: str, price: Decimal):
 
 def validate_min_notional(symbol: str, price: Decimal, quantity: Decimal):
     """Validate against Binance MIN_NOTIONAL filter."""
-    rules = get_symbol_rules(symbol)
-    min_notional = Decimal(rules["minNotional"])
+    min_notional = _decimal_rules(symbol)["minNotional"]
     notional = price * quantity
 
     if notional < min_notional:
@@ -69,26 +83,24 @@ def simulate_slippage(price: Decimal, side: str) -> Decimal:
     Market buys get slightly worse (higher) price, sells get slightly lower.
     Random component within configured BPS range.
     """
-    bps = Decimal(str(settings.SLIPPAGE_BPS))
     # Random slippage between 0 and configured max
-    random_factor = Decimal(str(random.uniform(0, float(bps))))
-    slippage_pct = random_factor / Decimal('10000')
+    # Quantized: Decimal(float) would carry the float's full ~50-digit binary expansion
+    random_factor = Decimal(random.uniform(0, _MAX_SLIPPAGE_BPS)).quantize(_SLIPPAGE_STEP)
+    slippage_pct = random_factor / _BPS_PER_UNIT
 
     if side == 'BUY':
-        return price * (Decimal('1') + slippage_pct)
+        return price * (_ONE + slippage_pct)
     else:  # SELL
-        return price * (Decimal('1') - slippage_pct)
+        return price * (_ONE - slippage_pct)
 
 
 def round_quantity(symbol: str, quantity: Decimal) -> Decimal:
     """Round quantity to valid stepSize."""
-    rules = get_symbol_rules(symbol)
-    step_size = Decimal(rules["stepSize"])
+    step_size = _decimal_rules(symbol)["stepSize"]
     return quantity.quantize(step_size, rounding=ROUND_DOWN)
 
 
 def round_price(symbol: str, price: Decimal) -> Decimal:
     """Round price to valid tickSize."""
-    rules = get_symbol_rules(symbol)
-    tick_size = Decimal(rules["tickSize"])
+    tick_size = _decimal_rules(symbol)["tickSize"]
     return price.quantize(tick_size, rounding=ROUND_DOWN)
@@ -2,23 +2,48 @@
 Centralized Price Engine
 - ONE WebSocket per symbol
 - Checks ALL pending limit/stop orders on each price tick
+- Hands triggered fills to a small pool of fill workers via a queue
 - Checks ALL active price alerts on each tick
 - Updates position current_value periodically
 - Broadcasts prices to connected frontend clients
 """
 import asyncio
 import json
+import logging
+import time
 from decimal import Decimal
-from datetime import datetime
+from app.utils.clock import utcnow
 from typing import Dict, Set, Callable, Optional
 from collections import defaultdict
 from sqlmodel import Session, select
-from app.core.database import engine
+from fastapi import HTTPException
+from sqlalchemy import and_, bindparam, or_, update
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm.exc import StaleDataError
+from app.core.database import begin_write, engine
 from app.core.config import settings
-from app.models.database import Order, Position, TradingAccount, PriceAlert
+from app.models.database import Order, Position, PriceAlert
 from app.services.fee_service import calculate_fee
 
+logger = logging.getLogger(__name__)
+
 POSITION_UPDATE_INTERVAL = 10
+RECONNECT_MAX_DELAY = 60  # seconds; reconnect backoff doubles from 1s up to this
+WS_SEND_TIMEOUT = 2  # seconds before a slow frontend socket is dropped
+PRICE_MAX_AGE = 5  # seconds; streams tick every 1s, so older means the stream is down
+FILL_WORKERS = 4  # bounds threads/DB connections used for engine fills
+
+_ZERO = Decimal('0')
+
+# Per-tick queries, built once; each tick only binds symbol and price.
+_SELECT_TRIGGERED_ALERTS = select(PriceAlert).where(
+    PriceAlert.symbol == bindparam("symbol"),
+    PriceAlert.is_active == True,  # noqa: E712
+    or_(
+        and_(PriceAlert.condition == 'ABOVE', PriceAlert.target_price <= bindparam("price")),
+        and_(PriceAlert.condition == 'BELOW', PriceAlert.target_price >= bindparam("price")),
+    ),
+)
 
 
 class PriceEngine:
@@ -26,15 +51,31 @@ class PriceEngine:
         self._running = False
         self._tasks: Dict[str, asyncio.Task] = {}
         self._latest_prices: Dict[str, Decimal] = {}
+        self._price_times: Dict[str, float] = {}  # symbol -> time.monotonic() of last tick
         self._ws_subscribers: Dict[str, Set] = defaultdict(set)
         self._alert_callbacks: list = []
-        self._fill_lock = asyncio.Lock()  # prevent concurrent fills
+        # Each item is one account's triggered (order, fill_price) list
+        self._fill_queue: asyncio.Queue = asyncio.Queue()
+        self._queued_orders: Set[int] = set()  # enqueued, not yet processed
+        self._select_triggered = select(Order).where(
+            Order.symbol == bindparam("symbol"),
+            Order.order_status == 'PENDING',
+            self._trigger_condition(bindparam("price")),
+        )
 
     @property
     def latest_prices(self):
         return dict(self._latest_prices)
 
-    def get_price(self, symbol: str) -> Optional[Decimal]:
+    def get_price(self, symbol: str, max_age: Optional[float] = None) -> Optional[Decimal]:
+        """
+        Last streamed price, or None if there is none (or it's older than max_age
+        seconds). Plain dict reads, so it's safe to call from worker threads.
+        """
+        if max_age is not None:
+            ts = self._price_times.get(symbol)
+            if ts is None or time.monotonic() - ts > max_age:
+                return None
         return self._latest_prices.get(symbol)
 
     def subscribe(self, symbol: str, ws):
@@ -53,19 +94,21 @@ class PriceEngine:
         for symbol in settings.SUPPORTED_SYMBOLS:
             self._tasks[symbol] = asyncio.create_task(self._monitor_symbol(symbol))
         self._tasks['_position_updater'] = asyncio.create_task(self._position_update_loop())
-        print(f"[PriceEngine] Started monitoring {settings.SUPPORTED_SYMBOLS}")
+        for i in range(FILL_WORKERS):
+            self._tasks[f'_fill_worker_{i}'] = asyncio.create_task(self._fill_worker())
+        logger.info("Started monitoring %s", settings.SUPPORTED_SYMBOLS)
 
     async def stop(self):
         self._running = False
         for task in self._tasks.values():
             task.cancel()
         self._tasks.clear()
-        print("[PriceEngine] Stopped")
+        logger.info("Stopped")
 
     async def _monitor_symbol(self, symbol: str):
         from app.services.binance_service import get_client
 
-        tick_count = 0
+        delay = 1
 
         while self._running:
             try:
@@ -82,63 +125,149 @@ class PriceEngine:
                             continue
                         price = Decimal(price_str)
                         self._latest_prices[symbol] = price
+                        self._price_times[symbol] = time.monotonic()
+                        delay = 1  # stream is healthy again
 
                         # Broadcast every tick
                         await self._broadcast(symbol, price)
 
-                        # Check orders/alerts every 5 ticks to avoid blocking
-                        tick_count += 1
-                        if tick_count % 5 == 0:
-                            await self._check_orders(symbol, price)
-                            await self._check_price_alerts(symbol, price)
+                        # Trigger checks run on every tick: the DB work is in a
+                        # worker thread and fills are queued, so a tick costs
+                        # one indexed query instead of blocking the stream.
+                        await self._check_tick(symbol, price)
 
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                print(f"[PriceEngine] {symbol} WS error: {e}, reconnecting in 5s...")
-                await asyncio.sleep(5)
+                logger.warning("%s WS error: %s, reconnecting in %ss...", symbol, e, delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
 
     async def _broadcast(self, symbol: str, price: Decimal):
-        dead = set()
+        subscribers = list(self._ws_subscribers[symbol])  # may change while we await
+        if not subscribers:
+            return
         msg = json.dumps({"symbol": symbol, "price": str(price)})
-        for ws in self._ws_subscribers[symbol]:
-            try:
-                await ws.send_text(msg)
-            except Exception:
-                dead.add(ws)
+        # Send to everyone concurrently so one slow client can't hold up the
+        # tick (and the order checks behind it) for the rest.
+        results = await asyncio.gather(
+            *(asyncio.wait_for(ws.send_text(msg), WS_SEND_TIMEOUT) for ws in subscribers),
+            return_exceptions=True,
+        )
+        dead = {ws for ws, r in zip(subscribers, results) if isinstance(r, BaseException)}
         self._ws_subscribers[symbol] -= dead
 
-    async def _check_orders(self, symbol: str, current_price: Decimal):
-        async with self._fill_lock:  # prevent concurrent fills on same order
-            with Session(engine) as session:
-                pending_orders = session.exec(
-                    select(Order).where(
-                        Order.symbol == symbol,
-                        Order.order_status == 'PENDING',
-                    )
-                ).all()
-
-                for order in pending_orders:
-                    fill_result = self._should_fill(order, current_price)
-                    if fill_result is None:
-                        continue
-
-                    fill_price = fill_result
-                    try:
+    async def _check_tick(self, symbol: str, current_price: Decimal):
+        """
+        Order and alert checks for one tick, with both queries run in ONE
+        worker-thread hop on ONE pooled connection.
+        """
+        pending_orders, triggered_alerts = await asyncio.to_thread(
+            self._tick_queries, symbol, current_price
+        )
+        self._enqueue_fills(pending_orders, current_price)
+        await self._dispatch_alerts(symbol, current_price, triggered_alerts)
+
+    def _tick_queries(self, symbol: str, current_price: Decimal):
+        with Session(engine, expire_on_commit=False) as session:
+            pending_orders = self._select_pending(session, symbol, current_price)
+            triggered_alerts = self._deactivate_alerts(session, symbol, current_price)
+            return pending_orders, triggered_alerts
+
+    def _enqueue_fills(self, pending_orders: list, current_price: Decimal):
+        # Group triggered orders by account so fills on the same balance
+        # row stay sequential, while different accounts run concurrently.
+        triggered = defaultdict(list)
+        for order in pending_orders:
+            if order.id in self._queued_orders:
+                continue  # already waiting for a fill worker
+            fill_price = self._should_fill(order, current_price)
+            if fill_price is not None:
+                triggered[order.user_id].append((order, fill_price))
+
+        for fills in triggered.values():
+            self._queued_orders.update(order.id for order, _ in fills)
+            self._fill_queue.put_nowait(fills)
+
+    async def _fill_worker(self):
+        while True:
+            fills = await self._fill_queue.get()
+            try:
+                await asyncio.to_thread(self._fill_account_orders, fills)
+            except Exception as e:
+                logger.error("Fill worker error: %s", e)
+            finally:
+                self._queued_orders.difference_update(order.id for order, _ in fills)
+                self._fill_queue.task_done()
+
+    def _select_pending(self, session: Session, symbol: str, current_price: Decimal) -> list:
+        return session.scalars(
+            self._select_triggered, {"symbol": symbol, "price": current_price}
+        ).all()
+
+    def _fill_account_orders(self, fills: list):
+        """
+        Fill one account's triggered orders in ONE transaction. Runs in a
+        worker thread with its own Session. Each fill gets a SAVEPOINT, so an
+        order the account can't cover (an HTTPException from the fill) is
+        cancelled without undoing the others. Database trouble (a stale
+        account version, "database is locked", deadlocks, serialization
+        failures) rolls back the whole batch and leaves it PENDING for the
+        next tick instead of cancelling valid orders.
+        """
+        filled = []
+        with Session(engine, expire_on_commit=False) as session:
+            begin_write(session)
+            for order, fill_price in fills:
+                try:
+                    with session.begin_nested():
                         self._execute_engine_fill(session, order, fill_price)
-                        print(f"[PriceEngine] Filled #{order.id}: {order.side} {order.quantity} {order.symbol} @ {fill_price}")
-                    except Exception as e:
-                        print(f"[PriceEngine] Fill failed #{order.id}: {e}")
+                    filled.append((order, fill_price))
+                except HTTPException as e:
+                    logger.warning("Fill failed #%s: %s", order.id, e.detail)
+                    try:
+                        # Only flip the status, and only if nothing else touched it
+                        session.execute(
+                            update(Order)
+                            .where(Order.id == order.id, Order.order_status == 'PENDING')
+                            .values(order_status='CANCELLED', updated_at=utcnow())
+                            .execution_options(synchronize_session=False)
+                        )
+                    except DBAPIError as e:
                         session.rollback()
-                        try:
-                            order = session.exec(select(Order).where(Order.id == order.id)).first()
-                            if order and order.order_status == 'PENDING':
-                                order.order_status = 'CANCELLED'
-                                order.updated_at = datetime.utcnow()
-                                session.add(order)
-                                session.commit()
-                        except Exception:
-                            pass
+                        logger.warning("Fill batch deferred (%d orders): %s", len(fills), e)
+                        return
+                except (StaleDataError, DBAPIError) as e:
+                    session.rollback()
+                    logger.warning("Fill batch deferred (%d orders): %s", len(fills), e)
+                    return
+            try:
+                session.commit()
+            except Exception as e:
+                # Nothing was applied; the orders stay PENDING for the next tick
+                session.rollback()
+                logger.error("Fill batch failed (%d orders): %s", len(fills), e)
+                return
+
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        for order, fill_price in filled:
+            logger.info("Filled #%s: %s %s %s @ %s", order.id, order.side, order.quantity, order.symbol, fill_price)
+
+    @staticmethod
+    def _trigger_condition(current_price):
+        """
+        SQL form of the trigger half of _should_fill(), so each tick loads only
+        orders that will fill instead of every pending order for the symbol.
+        """
+        return or_(
+            and_(Order.order_type == 'LIMIT', Order.side == 'BUY', Order.price >= current_price),
+            and_(Order.order_type == 'LIMIT', Order.side == 'SELL', Order.price <= current_price),
+            and_(Order.order_type == 'STOP_LOSS_LIMIT', Order.side == 'SELL', Order.stop_price >= current_price),
+            and_(Order.order_type == 'STOP_LOSS_LIMIT', Order.side == 'BUY', Order.stop_price <= current_price),
+            and_(Order.order_type == 'TAKE_PROFIT_LIMIT', Order.side == 'SELL', Order.stop_price <= current_price),
+            and_(Order.order_type == 'TAKE_PROFIT_LIMIT', Order.side == 'BUY', Order.stop_price >= current_price),
+        )
 
     def _should_fill(self, order: Order, current_price: Decimal) -> Optional[Decimal]:
         """Return fill price if order should be filled, None otherwise."""
@@ -181,76 +310,81 @@ class PriceEngine:
         return None
 
     def _execute_engine_fill(self, session: Session, order: Order, fill_price: Decimal):
-        """Fill order via engine — single atomic transaction."""
-        # Re-check order status to prevent double fill
-        fresh_order = session.exec(select(Order).where(Order.id == order.id)).first()
-        if not fresh_order or fresh_order.order_status != 'PENDING':
-            return
+        """Fill order via engine. Caller commits (see _fill_account_orders)."""
+        from app.services.order_service import _apply_fill, _load_order_for_fill
 
-        account = session.exec(
-            select(TradingAccount).where(TradingAccount.user_id == fresh_order.user_id)
-        ).first()
-        if not account:
+        # Re-check order status (to prevent double fill) in the same query
+        # that loads the account and position
+        fresh_order, account, position = _load_order_for_fill(session, order.id)
+        if not fresh_order or fresh_order.order_status != 'PENDING' or not account:
             return
 
         qty = fresh_order.quantity - fresh_order.filled_quantity
-        if qty <= Decimal('0'):
+        if qty <= _ZERO:
             return
 
         is_maker = fresh_order.order_type == 'LIMIT'
         fee, _, fee_asset, _ = calculate_fee(fill_price, qty, is_maker, account)
 
-        from app.services.order_service import _apply_fill
-        _apply_fill(session, fresh_order, account, qty, fill_price, fee, fee_asset, is_maker)
-        session.commit()
-
-    async def _check_price_alerts(self, symbol: str, current_price: Decimal):
-        with Session(engine) as session:
-            alerts = session.exec(
-                select(PriceAlert).where(
-                    PriceAlert.symbol == symbol,
-                    PriceAlert.is_active == True,
-                )
-            ).all()
-
-            for alert in alerts:
-                triggered = False
-                if alert.condition == 'ABOVE' and current_price >= alert.target_price:
-                    triggered = True
-                elif alert.condition == 'BELOW' and current_price <= alert.target_price:
-                    triggered = True
-
-                if triggered:
-                    alert.is_active = False
-                    alert.triggered_at = datetime.utcnow()
-                    session.add(alert)
-                    session.commit()
-                    print(f"[PriceEngine] Alert #{alert.id}: {symbol} {alert.condition} {alert.target_price}")
-
-                    for cb in self._alert_callbacks:
-                        try:
-                            if asyncio.iscoroutinefunction(cb):
-                                await cb(alert, current_price)
-                            else:
-                                cb(alert, current_price)
-                        except Exception as e:
-                            print(f"[PriceEngine] Alert cb error: {e}")
+        _apply_fill(session, fresh_order, account, position, qty, fill_price, fee, fee_asset, is_maker, utcnow())
+
+    async def _dispatch_alerts(self, symbol: str, current_price: Decimal, triggered: list):
+        for alert in triggered:
+            logger.info("Alert #%s: %s %s %s", alert.id, symbol, alert.condition, alert.target_price)
+
+            for cb in self._alert_callbacks:
+                try:
+                    if asyncio.iscoroutinefunction(cb):
+                        await cb(alert, current_price)
+                    else:
+                        cb(alert, current_price)
+                except Exception as e:
+                    logger.error("Alert callback error: %s", e)
+
+    @staticmethod
+    def _deactivate_alerts(session: Session, symbol: str, current_price: Decimal) -> list:
+        # Only alerts the price hits come back; the rest stay in the DB
+        triggered = session.scalars(
+            _SELECT_TRIGGERED_ALERTS, {"symbol": symbol, "price": current_price}
+        ).all()
+        now = utcnow()
+        for alert in triggered:
+            alert.is_active = False
+            alert.triggered_at = now
+            session.add(alert)
+        if triggered:
+            session.commit()
+        return triggered
 
     async def _position_update_loop(self):
+        revalued: Dict[str, Decimal] = {}  # symbol -> price positions were last marked at
         while self._running:
             await asyncio.sleep(POSITION_UPDATE_INTERVAL)
+            # Only symbols whose price moved; a quiet or stalled stream writes nothing
+            changed = {s: p for s, p in self._latest_prices.items() if revalued.get(s) != p}
+            if not changed:
+                continue
             try:
-                with Session(engine) as session:
-                    positions = session.exec(select(Position)).all()
-                    for pos in positions:
-                        price = self._latest_prices.get(pos.symbol)
-                        if price and pos.quantity > 0:
-                            pos.current_value = pos.quantity * price
-                            pos.unrealized_profit = pos.quantity * (price - pos.average_price)
-                            session.add(pos)
-                    session.commit()
+                await asyncio.to_thread(self._revalue_positions, changed)
+                revalued.update(changed)
             except Exception as e:
-                print(f"[PriceEngine] Position update error: {e}")
+                logger.error("Position update error: %s", e)
+
+    @staticmethod
+    def _revalue_positions(prices: Dict[str, Decimal]):
+        """Mark every open position to market with one UPDATE per symbol, computed in SQL."""
+        with Session(engine, expire_on_commit=False) as session:
+            for symbol, price in prices.items():
+                session.execute(
+                    update(Position)
+                    .where(Position.symbol == symbol, Position.quantity > 0)
+                    .values(
+                        current_value=Position.quantity * price,
+                        unrealized_profit=Position.quantity * (price - Position.average_price),
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+            session.commit()
 
 
 price_engine = PriceEngine()
@@ -0,0 +1,9 @@
+from datetime import datetime, timezone
+
+
+def utcnow() -> datetime:
+    """
+    Current UTC time as a naive datetime — the form every timestamp column
+    is stored and compared in. Drop-in for the deprecated datetime.utcnow().
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
@@ -27,7 +27,7 @@ const Dashboard = () => {
 
   const fetchData = useCallback(async () => {
     try {
-      const [accRes, ordRes] = await Promise.all([api.get('/account'), api.get('/orders')]);
+      const [accRes, ordRes] = await Promise.all([api.get('/account'), api.get('/orders', { params: { limit: 5 } })]);
       setAccount(accRes.data);
       setRecentOrders(ordRes.data.slice(0, 5));
     } catch { toast.error('데이터를 불러올 수 없어요'); }
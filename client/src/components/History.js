@@ -7,10 +7,24 @@ const STATUS_KR = { FILLED: '체결', PENDING: '대기중', PARTIALLY_FILLED: '
 const SIDE_KR = { BUY: '매수', SELL: '매도' };
 const TYPE_KR = { MARKET: '시장가', LIMIT: '지정가', STOP_LOSS_LIMIT: '손절매', TAKE_PROFIT_LIMIT: '익절매' };
 
+// Keyset cursor the API sends for the next page (null on the last page)
+const nextCursor = (res) => res.headers['x-next-cursor']
+  ? { before: res.headers['x-next-cursor'], before_id: res.headers['x-next-cursor-id'] }
+  : null;
+
+// One row per order, newest first: open orders are fetched apart from the history pages
+const mergeOrders = (...lists) => {
+  const byId = new Map();
+  lists.flat().forEach(o => byId.set(o.id, o));
+  return [...byId.values()].sort((a, b) => b.created_at.localeCompare(a.created_at) || b.id - a.id);
+};
+
 const History = () => {
   const [tab, setTab] = useState('orders');
   const [orders, setOrders] = useState([]);
+  const [ordersCursor, setOrdersCursor] = useState(null);
   const [transactions, setTransactions] = useState([]);
+  const [txCursor, setTxCursor] = useState(null);
   const [alerts, setAlerts] = useState([]);
   const [loading, setLoading] = useState(true);
   const [alertSymbol, setAlertSymbol] = useState('BTCUSDT');
@@ -21,13 +35,28 @@ const History = () => {
 
   const fetchAll = async () => {
     try {
-      const [o, t, a] = await Promise.all([api.get('/orders'), api.get('/account/transactions'), api.get('/alerts')]);
-      setOrders(o.data); setTransactions(t.data); setAlerts(a.data);
+      const [o, open, t, a] = await Promise.all([api.get('/orders'), api.get('/orders/open'), api.get('/account/transactions'), api.get('/alerts')]);
+      setOrders(mergeOrders(o.data, open.data)); setOrdersCursor(nextCursor(o));
+      setTransactions(t.data); setTxCursor(nextCursor(t)); setAlerts(a.data);
     } catch { toast.error('내역을 불러올 수 없어요'); }
     finally { setLoading(false); }
   };
   useEffect(() => { fetchAll(); }, []);
 
+  const loadMoreOrders = async () => {
+    try {
+      const res = await api.get('/orders', { params: ordersCursor });
+      setOrders(p => mergeOrders(p, res.data)); setOrdersCursor(nextCursor(res));
+    } catch { toast.error('내역을 불러올 수 없어요'); }
+  };
+
+  const loadMoreTransactions = async () => {
+    try {
+      const res = await api.get('/account/transactions', { params: txCursor });
+      setTransactions(p => [...p, ...res.data]); setTxCursor(nextCursor(res));
+    } catch { toast.error('내역을 불러올 수 없어요'); }
+  };
+
   const handleCancel = async (id) => {
     try { await api.delete(`/orders/${id}`); setOrders(p => p.map(o => o.id === id ? { ...o, order_status: 'CANCELLED' } : o)); toast.success('주문이 취소됐어요'); }
     catch (e) { toast.error(e.response?.data?.detail || '취소 실패'); }
@@ -118,6 +147,7 @@ const History = () => {
               </table>
             </div>
           )}
+          {ordersCursor && <button onClick={loadMoreOrders} className="w-full py-3 border-t border-dark-600 text-xs font-medium text-muted hover:text-white transition-colors">더 보기</button>}
         </div>
       )}
 
@@ -162,6 +192,7 @@ const History = () => {
               </table>
             </div>
           )}
+          {txCursor && <button onClick={loadMoreTransactions} className="w-full py-3 border-t border-dark-600 text-xs font-medium text-muted hover:text-white transition-colors">더 보기</button>}
         </div>
       )}
 
@@ -0,0 +1,41 @@
+from decimal import Decimal
+
+from sqlalchemy import inspect, text
+from sqlmodel import Session, SQLModel, select
+
+import app.core.database as database_module
+from app.models.database import Position, TradingAccount, User, create_db_and_tables
+
+
+def test_duplicate_positions_are_merged_before_the_unique_index(tmp_path, monkeypatch):
+    engine = database_module.build_engine(f"sqlite:///{tmp_path / 'beencoin.db'}")
+    monkeypatch.setattr(database_module, "engine", engine)
+    # A database from before the unique index, holding a split position
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_position_acct_sym"))
+    with Session(engine) as session:
+        user = User(username="trader", hashed_password="x")
+        session.add(user)
+        session.commit()
+        account = TradingAccount(user_id=user.id)
+        session.add(account)
+        session.commit()
+        for quantity, cost in (('1', '50000'), ('3', '210000')):
+            session.add(Position(
+                account_id=account.id, symbol="BTCUSDT",
+                quantity=Decimal(quantity), total_cost=Decimal(cost),
+            ))
+        session.add(Position(account_id=account.id, symbol="ETHUSDT", quantity=Decimal('2')))
+        session.commit()
+
+    create_db_and_tables()
+
+    assert "ix_position_acct_sym" in {i["name"] for i in inspect(engine).get_indexes("position")}
+    with Session(engine) as session:
+        positions = session.exec(select(Position).order_by(Position.id)).all()
+        assert [(p.id, p.symbol) for p in positions] == [(1, "BTCUSDT"), (3, "ETHUSDT")]
+        btc = positions[0]
+        assert btc.quantity == Decimal('4')
+        assert btc.total_cost == Decimal('260000')
+        assert btc.average_price == Decimal('65000')
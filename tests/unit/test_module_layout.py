@@ -0,0 +1,15 @@
+import ast
+from collections import Counter
+from pathlib import Path
+
+ORDER_SERVICE = Path(__file__).resolve().parents[2] / "app" / "services" / "order_service.py"
+
+
+def test_no_duplicate_defs():
+    tree = ast.parse(ORDER_SERVICE.read_text(encoding="utf-8"))
+    names = Counter(
+        n.name for n in tree.body
+        if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+    )
+    assert names["create_order"] == 1
+    assert [name for name, count in names.items() if count > 1] == []
@@ -0,0 +1,140 @@
+import asyncio
+import time
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+
+import app.services.order_batcher as batcher_module
+from app.models.database import Order, Position, TradingAccount, User
+from app.schemas.order import OrderCreate
+from app.services.order_batcher import OrderBatcher
+
+MARKET_PRICE = Decimal('50000')
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    monkeypatch.setattr(batcher_module, "engine", engine)
+    return engine
+
+
+@pytest.fixture
+def user_id(engine):
+    with Session(engine) as session:
+        user = User(username="trader", hashed_password="x")
+        session.add(user)
+        session.commit()
+        session.add(TradingAccount(user_id=user.id, balance=Decimal('100000')))
+        session.commit()
+        return user.id
+
+
+def _market_buy(quantity: str) -> OrderCreate:
+    return OrderCreate(symbol="BTCUSDT", side="BUY", order_type="MARKET", quantity=Decimal(quantity))
+
+
+def _limit_buy(quantity: str, price: str) -> OrderCreate:
+    return OrderCreate(
+        symbol="BTCUSDT", side="BUY", order_type="LIMIT",
+        quantity=Decimal(quantity), price=Decimal(price),
+    )
+
+
+def _batch(user_id: int, *orders: OrderCreate) -> list:
+    return [(user_id, order, MARKET_PRICE, None) for order in orders]
+
+
+def test_rejected_order_does_not_roll_back_the_batch(engine, user_id):
+    results = OrderBatcher._flush(_batch(
+        user_id, _market_buy('1'), _market_buy('100'), _limit_buy('0.5', '40000'),
+    ))
+
+    assert isinstance(results[1], HTTPException)
+    assert results[1].detail == "Insufficient balance"
+    assert [results[0].order_status, results[2].order_status] == ['FILLED', 'PENDING']
+    with Session(engine) as session:
+        assert len(session.exec(select(Order)).all()) == 2
+        position = session.exec(select(Position)).one()
+        assert position.quantity == Decimal('1')
+        account = session.exec(select(TradingAccount)).one()
+        assert account.balance < Decimal('50000')
+
+
+def test_failed_batch_commit_falls_back_to_one_transaction_per_order(engine, user_id, monkeypatch):
+    commits = []
+
+    class FlakySession(Session):
+        def commit(self):
+            commits.append(self)
+            if len(commits) == 1:
+                raise OperationalError("COMMIT", {}, Exception("database is locked"))
+            super().commit()
+
+    monkeypatch.setattr(batcher_module, "Session", FlakySession)
+    results = OrderBatcher._flush(_batch(user_id, _market_buy('1'), _limit_buy('0.5', '40000')))
+
+    assert [r.order_status for r in results] == ['FILLED', 'PENDING']
+    assert len(commits) == 3  # the failed batch commit, then one per order
+    with Session(engine) as session:
+        # The failed batch left nothing behind, so nothing is placed twice
+        assert len(session.exec(select(Order)).all()) == 2
+        assert session.exec(select(Position)).one().quantity == Decimal('1')
+
+
+def test_submit_raises_the_orders_http_exception(engine, user_id):
+    async def run():
+        batcher = OrderBatcher()
+        batcher.start()
+        try:
+            with pytest.raises(HTTPException) as exc:
+                await batcher.submit(user_id, _market_buy('100'), MARKET_PRICE)
+        finally:
+            await batcher.stop()
+        return exc.value
+
+    error = asyncio.run(run())
+    assert error.status_code == 400
+    assert error.detail == "Insufficient balance"
+
+
+def test_stop_resolves_the_batch_being_flushed(monkeypatch):
+    flushing = []
+
+    def slow_flush(batch):
+        flushing.append(batch)
+        time.sleep(0.2)
+        return ["placed"] * len(batch)
+
+    monkeypatch.setattr(OrderBatcher, "_flush", staticmethod(slow_flush))
+
+    async def run():
+        batcher = OrderBatcher()
+        batcher.start()
+        submitted = asyncio.create_task(batcher.submit(1, _market_buy('1'), MARKET_PRICE))
+        while not flushing:
+            await asyncio.sleep(0.01)
+        await batcher.stop()
+        return await asyncio.wait_for(submitted, 1)
+
+    assert asyncio.run(run()) == "placed"
+
+
+def test_single_order_does_not_wait_for_the_batch_window(monkeypatch):
+    monkeypatch.setattr(batcher_module, "BATCH_MAX_WAIT", 5)
+    monkeypatch.setattr(OrderBatcher, "_flush", staticmethod(lambda batch: ["placed"] * len(batch)))
+
+    async def run():
+        batcher = OrderBatcher()
+        batcher.start()
+        try:
+            return await asyncio.wait_for(batcher.submit(1, _market_buy('1'), MARKET_PRICE), 1)
+        finally:
+            await batcher.stop()
+
+    assert asyncio.run(run()) == "placed"
@@ -0,0 +1,104 @@
+import asyncio
+from decimal import Decimal
+
+import httpx
+import pytest
+
+import app.core.database as database_module
+import app.services.order_batcher as batcher_module
+import app.services.price_engine as price_engine_module
+from app.main import app
+from app.models.database import create_db_and_tables
+from app.services.order_batcher import order_batcher
+from app.services.price_engine import price_engine
+
+API = "/api/v1"
+
+
+@pytest.fixture(autouse=True)
+def db(tmp_path, monkeypatch):
+    # A file database with the app's own engine setup: separate pooled
+    # connections lock each other the way they do in production, which an
+    # in-memory StaticPool (one shared connection) never would.
+    engine = database_module.build_engine(f"sqlite:///{tmp_path / 'beencoin.db'}")
+    for module in (database_module, batcher_module, price_engine_module):
+        monkeypatch.setattr(module, "engine", engine)
+    create_db_and_tables()
+    monkeypatch.setitem(price_engine._latest_prices, "BTCUSDT", Decimal('50000'))
+    monkeypatch.setitem(price_engine._price_times, "BTCUSDT", float("inf"))
+    return engine
+
+
+def _with_batcher(scenario):
+    """Run `scenario(client)` against the app with the order batcher started, as in the lifespan."""
+    async def run():
+        order_batcher.start()
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await scenario(client)
+        finally:
+            await order_batcher.stop()
+    return asyncio.run(run())
+
+
+async def _login(client, username="trader"):
+    credentials = {"username": username, "password": "pw123456"}
+    await client.post(f"{API}/auth/register", json=credentials)
+    token = (await client.post(f"{API}/auth/login", json=credentials)).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_order_goes_through_batcher_while_request_session_is_open():
+    # The request's session has already read the user when the batcher's
+    # own session starts writing; that must not wait on the request's lock.
+    async def scenario(client):
+        headers = await _login(client)
+        market = await client.post(f"{API}/orders", headers=headers, json={
+            "symbol": "BTCUSDT", "side": "BUY", "order_type": "MARKET", "quantity": "0.1",
+        })
+        limit = await client.post(f"{API}/orders", headers=headers, json={
+            "symbol": "BTCUSDT", "side": "BUY", "order_type": "LIMIT", "quantity": "0.1", "price": "40000",
+        })
+        listed = await client.get(f"{API}/orders", headers=headers)
+        return market, limit, listed
+
+    market, limit, listed = _with_batcher(scenario)
+
+    assert market.status_code == 200, market.text
+    assert market.json()["order_status"] == "FILLED"
+    assert limit.status_code == 200, limit.text
+    assert limit.json()["order_status"] == "PENDING"
+    assert [o["id"] for o in listed.json()] == [limit.json()["id"], market.json()["id"]]
+    # The POST response renders the fill exactly as later reads do
+    assert listed.json()[1]["filled_price"] == market.json()["filled_price"]
+
+
+def test_concurrent_orders_from_several_users(monkeypatch):
+    flushed = []
+    flush = batcher_module.OrderBatcher._flush
+
+    def recording_flush(batch):
+        flushed.append(len(batch))
+        return flush(batch)
+
+    monkeypatch.setattr(batcher_module.OrderBatcher, "_flush", staticmethod(recording_flush))
+
+    async def scenario(client):
+        logins = await asyncio.gather(*(_login(client, f"trader{i}") for i in range(5)))
+        orders = await asyncio.gather(*(
+            client.post(f"{API}/orders", headers=headers, json={
+                "symbol": "BTCUSDT", "side": "BUY", "order_type": "MARKET", "quantity": "0.1",
+            })
+            for headers in logins
+        ))
+        accounts = await asyncio.gather(*(client.get(f"{API}/account", headers=h) for h in logins))
+        return orders, accounts
+
+    orders, accounts = _with_batcher(scenario)
+
+    assert [o.status_code for o in orders] == [200] * 5, [o.text for o in orders]
+    assert {o.json()["order_status"] for o in orders} == {"FILLED"}
+    assert sum(flushed) == 5  # every order placed exactly once, however they were grouped
+    for account in accounts:
+        assert [p["quantity"] for p in account.json()["positions"]] == ["0.10000000"]